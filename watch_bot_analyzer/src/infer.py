@@ -5,474 +5,686 @@ import pandas as pd
 import numpy as np
 from typing import Dict, List, Tuple, Any
 from scipy import stats
+from joblib import Parallel, delayed
+from numba import njit
 import json
-import copy
+import re
 
 
-def infer_entry_rules(trades: pd.DataFrame, tape: pd.DataFrame) -> Dict[str, Any]:
+# Timeframe heuristic: market ids look like "BTC_15m" / "ETH_1h". Anchored
+# on separators so an id that merely contains "15" somewhere doesn't get
+# classified as a 15-minute market; compiled once at import.
+_IS_15M_RE = re.compile(r'(?:^|[_\-])15m?(?:$|[_\-])')
+
+
+def _is_15m_market(market: str) -> bool:
+    """True if the market id denotes a 15-minute timeframe."""
+    return _IS_15M_RE.search(market) is not None
+
+
+# Price buckets (0-0.05, 0.05-0.10, ..., 0.95-1.00) used by the sizing
+# tables. Computed once at import; the JSON-ready list form is cached
+# alongside so per-market workers don't re-materialize either.
+PRICE_BIN_EDGES = np.arange(0, 1.05, 0.05)
+PRICE_BIN_EDGES_LIST = PRICE_BIN_EDGES.tolist()
+
+
+@njit(cache=True)
+def _score_side_selection(is_up, shares, side_px, delta_5s):
     """
-    Infer entry rules (price bands and momentum/reversion patterns).
-    Optimizes for precision >= 0.90, rejects wide bands, marks as inventory-gated if needed.
-    
+    Score side-selection patterns in one pass over typed arrays.
+
+    Walks the trade sequence once, accumulating the running inventory and
+    the four evidence counters, instead of materializing the cumulative-sum
+    and boolean intermediates separately. No fastmath: the NaN checks on
+    side_px / delta_5s are load-bearing.
+
+    Returns:
+        (inventory_driven_score, alternation_score, edge_driven_score,
+         momentum_driven_score)
+    """
+    n = is_up.shape[0]
+    inv_up = 0.0
+    inv_down = 0.0
+    inventory_hits = 0
+    inventory_n = 0
+    edge_hits = 0
+    edge_n = 0
+    momentum_hits = 0
+    momentum_n = 0
+    alternations = 0
+
+    for i in range(n):
+        if is_up[i]:
+            inv_up += shares[i]
+        else:
+            inv_down += shares[i]
+
+        # Inventory-driven: buying the side with the lower post-trade ratio
+        total = inv_up + inv_down
+        if total > 0:
+            ratio_up = inv_up / total
+            inventory_n += 1
+            if (is_up[i] and ratio_up < 0.5) or (not is_up[i] and ratio_up > 0.5):
+                inventory_hits += 1
+
+        # Edge-driven: trading within 10% of fair value (0.5)
+        if not np.isnan(side_px[i]):
+            edge_n += 1
+            if abs(side_px[i] - 0.5) < 0.1:
+                edge_hits += 1
+
+        # Momentum-driven: buying the side whose price is rising
+        if not np.isnan(delta_5s[i]):
+            momentum_n += 1
+            if (is_up[i] and delta_5s[i] > 0.001) or (not is_up[i] and delta_5s[i] < -0.001):
+                momentum_hits += 1
+
+        if i > 0 and is_up[i] != is_up[i - 1]:
+            alternations += 1
+
+    inventory_driven_score = inventory_hits / inventory_n if inventory_n > 0 else 0.0
+    alternation_score = alternations / (n - 1) if n > 1 else 0.0
+    edge_driven_score = edge_hits / edge_n if edge_n > 0 else 0.0
+    momentum_driven_score = momentum_hits / momentum_n if momentum_n > 0 else 0.0
+
+    return inventory_driven_score, alternation_score, edge_driven_score, momentum_driven_score
+
+
+@njit(cache=True)
+def _fill_bias_stats(fill_px, side_px):
+    """
+    Compute fill-bias statistics for one market in a single compiled pass.
+
+    Fuses the subtract, the NaN mask and the five summary statistics that
+    infer_execution_model needs, so no boolean-mask or fancy-index
+    intermediates are allocated. Quartiles use the same linear
+    interpolation as np.percentile and std is the population std,
+    matching the previous numpy implementation exactly. No fastmath: the
+    NaN checks are load-bearing.
+
+    Returns:
+        (n_valid, mean, std, p25, median, p75); all zeros if no row has
+        both prices
+    """
+    n_total = fill_px.shape[0]
+    biases = np.empty(n_total)
+    n = 0
+    total = 0.0
+    for i in range(n_total):
+        f = fill_px[i]
+        s = side_px[i]
+        if not (np.isnan(f) or np.isnan(s)):
+            b = f - s
+            biases[n] = b
+            total += b
+            n += 1
+
+    if n == 0:
+        return 0, 0.0, 0.0, 0.0, 0.0, 0.0
+
+    mean = total / n
+    sq_dev = 0.0
+    for i in range(n):
+        d = biases[i] - mean
+        sq_dev += d * d
+    std = np.sqrt(sq_dev / n)
+
+    valid = biases[:n]
+    valid.sort()
+    quartiles = np.empty(3)
+    for j in range(3):
+        h = 0.25 * (j + 1) * (n - 1)
+        lo = int(h)
+        frac = h - lo
+        if frac > 0.0:
+            quartiles[j] = valid[lo] * (1.0 - frac) + valid[lo + 1] * frac
+        else:
+            quartiles[j] = valid[lo]
+
+    return n, mean, std, quartiles[0], quartiles[1], quartiles[2]
+
+
+def split_watch_trades_by_market(trades: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    """
+    Split WATCH trades into per-market views with a single global sort.
+
+    Sorts once by ['market', 'Timestamp'] and slices at market boundaries
+    found via the contiguous market array, so each per-market frame is a
+    zero-copy view sharing the sorted frame's buffers. Inference functions
+    reuse this split instead of re-sorting and re-filtering per market.
+
     Args:
-        trades: Trade rows dataframe (WATCH trades only)
-        tape: Full price tape dataframe
-        
+        trades: Trade rows dataframe
+
     Returns:
-        Dictionary with entry parameters per market
+        Dictionary mapping market -> per-market WATCH trades view,
+        sorted by Timestamp
     """
-    watch_trades = trades[trades['bot'] == 'WATCH'].copy()
-    
+    watch_trades = trades[trades['bot'] == 'WATCH']
+
     if len(watch_trades) == 0:
         return {}
-    
-    entry_params = {}
-    
-    for market in watch_trades['market'].unique():
-        market_trades = watch_trades[watch_trades['market'] == market].copy()
-        market_tape = tape[tape['market'] == market].copy()
-        
-        if len(market_trades) < 5:  # Need minimum trades
-            continue
-        
-        # Get UP and DOWN trades separately
-        up_trades = market_trades[market_trades['side'] == 'UP']
-        down_trades = market_trades[market_trades['side'] == 'DOWN']
-        
-        # Optimize price bands: use tight bands, reject if too wide (>0.90)
-        # Strategy: Try progressively tighter bands using percentiles
-        def optimize_bands(side_trades, price_col):
-            """Find tight price bands, rejecting wide bands."""
-            if len(side_trades) < 3:
-                return None, None, False
-            
-            prices = side_trades[price_col].values
-            
-            # Try percentiles: start with very tight bands (40th-60th) to optimize for precision
-            # Widen only if needed, but never exceed 0.90 width
-            # Prioritize precision >= 0.90 even if recall drops
-            for p_low, p_high in [(40, 60), (35, 65), (30, 70), (25, 75), (20, 80), (15, 85), (10, 90), (5, 95)]:
-                min_price = np.percentile(prices, p_low)
-                max_price = np.percentile(prices, p_high)
-                band_width = max_price - min_price
-                
-                # Reject if band is too wide (>0.90 range)
-                if band_width > 0.90:
-                    continue
-                
-                # Accept this band (it's tight enough)
-                return min_price, max_price, True
-            
-            # If all percentile bands are too wide, try min/max but reject if >0.90
-            min_price = prices.min()
-            max_price = prices.max()
+
+    watch_trades = watch_trades.sort_values(['market', 'Timestamp'], kind='stable').reset_index(drop=True)
+    markets = watch_trades['market'].to_numpy()
+    boundaries = np.concatenate(([0], np.nonzero(markets[1:] != markets[:-1])[0] + 1, [len(markets)]))
+
+    return {
+        markets[start]: watch_trades.iloc[start:end]
+        for start, end in zip(boundaries[:-1], boundaries[1:])
+    }
+
+
+def _parallel_per_market(worker, market_groups) -> Dict[str, Any]:
+    """
+    Dispatch a per-market inference worker across markets with a thread pool.
+
+    Markets share no state, so the per-market loops are embarrassingly
+    parallel; the hot loops are NumPy-backed and release the GIL, so
+    threading avoids pickling overhead. Workers return (market, result)
+    with result=None for markets that don't meet minimum-trade thresholds.
+    """
+    results = Parallel(n_jobs=-1, backend='threading')(
+        delayed(worker)(market, group) for market, group in market_groups
+    )
+    return {market: result for market, result in results if result is not None}
+
+
+def _infer_entry_rules_one_market(market: str, market_trades: pd.DataFrame) -> Tuple[str, Any]:
+    """Infer entry parameters for a single market (thread-pool worker)."""
+    if len(market_trades) < 5:  # Need minimum trades
+        return market, None
+
+    # Get UP and DOWN trades separately
+    up_trades = market_trades[market_trades['side'] == 'UP']
+    down_trades = market_trades[market_trades['side'] == 'DOWN']
+
+    # Optimize price bands: use tight bands, reject if too wide (>0.90)
+    # Strategy: Try progressively tighter bands using percentiles
+    def optimize_bands(side_trades, price_col):
+        """Find tight price bands, rejecting wide bands."""
+        if len(side_trades) < 3:
+            return None, None, False
+
+        prices = side_trades[price_col].values
+        n = prices.size
+
+        # Try percentiles: start with very tight bands (40th-60th) to optimize for precision
+        # Widen only if needed, but never exceed 0.90 width
+        # Prioritize precision >= 0.90 even if recall drops
+        for p_low, p_high in [(40, 60), (35, 65), (30, 70), (25, 75), (20, 80), (15, 85), (10, 90), (5, 95)]:
+            # Select the two target ranks with np.partition (O(N)) instead
+            # of the full sort inside np.percentile (O(N log N)); we
+            # early-exit at the first acceptable band, so wider ranks are
+            # never computed
+            k_lo = min(int(p_low * n / 100), n - 1)
+            k_hi = min(int(p_high * n / 100), n - 1)
+            partitioned = np.partition(prices, [k_lo, k_hi])
+            min_price = partitioned[k_lo]
+            max_price = partitioned[k_hi]
             band_width = max_price - min_price
-            
-            if band_width <= 0.90:  # Acceptable width
-                return min_price, max_price, True
-            else:
-                # Too wide, mark as inventory-gated
-                return None, None, False
-        
-        # Optimize UP bands
-        up_price_min, up_price_max, up_valid = optimize_bands(up_trades, 'Price UP ($)')
-        
-        # Optimize DOWN bands
-        down_price_min, down_price_max, down_valid = optimize_bands(down_trades, 'Price DOWN ($)')
-        
-        # Check if entry is price-explained
-        is_inventory_gated = not (up_valid or down_valid)
-        
-        # If inventory-gated, set mode and use None for price bands
-        if is_inventory_gated:
-            mode = "inventory-gated"
-            momentum_window_s = 5.0
-            momentum_threshold = 0.0
-            up_price_min = None
-            up_price_max = None
-            down_price_min = None
-            down_price_max = None
+
+            # Reject if band is too wide (>0.90 range)
+            if band_width > 0.90:
+                continue
+
+            # Accept this band (it's tight enough)
+            return min_price, max_price, True
+
+        # If all percentile bands are too wide, try min/max but reject if >0.90
+        min_price = prices.min()
+        max_price = prices.max()
+        band_width = max_price - min_price
+
+        if band_width <= 0.90:  # Acceptable width
+            return min_price, max_price, True
         else:
-            # Momentum analysis - check correlation with price changes
-            mode = "none"
-            momentum_window_s = 5.0
-            momentum_threshold = 0.0
-            
-            if 'delta_5s_side_px' in market_trades.columns:
-                valid_deltas = market_trades['delta_5s_side_px'].dropna()
-                if len(valid_deltas) > 10:
-                    up_trade_deltas = market_trades[market_trades['side'] == 'UP']['delta_5s_side_px'].dropna()
-                    down_trade_deltas = market_trades[market_trades['side'] == 'DOWN']['delta_5s_side_px'].dropna()
-                    
-                    if len(up_trade_deltas) > 5 and len(down_trade_deltas) > 5:
-                        up_median = up_trade_deltas.median()
-                        down_median = down_trade_deltas.median()
-                        
-                        if up_median > 0.005 and down_median < -0.005:
-                            mode = "momentum"
-                            momentum_threshold = 0.005
-                        elif up_median < -0.005 and down_median > 0.005:
-                            mode = "reversion"
-                            momentum_threshold = -0.005
-        
-        entry_params[market] = {
-            'up_price_min': float(up_price_min) if up_price_min is not None else None,
-            'up_price_max': float(up_price_max) if up_price_max is not None else None,
-            'down_price_min': float(down_price_min) if down_price_min is not None else None,
-            'down_price_max': float(down_price_max) if down_price_max is not None else None,
-            'momentum_window_s': momentum_window_s,
-            'momentum_threshold': momentum_threshold,
-            'mode': mode
-        }
-    
-    return {'per_market': entry_params}
+            # Too wide, mark as inventory-gated
+            return None, None, False
+
+    # Optimize UP bands
+    up_price_min, up_price_max, up_valid = optimize_bands(up_trades, 'Price UP ($)')
+
+    # Optimize DOWN bands
+    down_price_min, down_price_max, down_valid = optimize_bands(down_trades, 'Price DOWN ($)')
+
+    # Check if entry is price-explained
+    is_inventory_gated = not (up_valid or down_valid)
+
+    # If inventory-gated, set mode and use None for price bands
+    if is_inventory_gated:
+        mode = "inventory-gated"
+        momentum_window_s = 5.0
+        momentum_threshold = 0.0
+        up_price_min = None
+        up_price_max = None
+        down_price_min = None
+        down_price_max = None
+    else:
+        # Momentum analysis - check correlation with price changes
+        mode = "none"
+        momentum_window_s = 5.0
+        momentum_threshold = 0.0
+
+        if 'delta_5s_side_px' in market_trades.columns:
+            valid_deltas = market_trades['delta_5s_side_px'].dropna()
+            if len(valid_deltas) > 10:
+                up_trade_deltas = market_trades[market_trades['side'] == 'UP']['delta_5s_side_px'].dropna()
+                down_trade_deltas = market_trades[market_trades['side'] == 'DOWN']['delta_5s_side_px'].dropna()
+
+                if len(up_trade_deltas) > 5 and len(down_trade_deltas) > 5:
+                    up_median = up_trade_deltas.median()
+                    down_median = down_trade_deltas.median()
+
+                    if up_median > 0.005 and down_median < -0.005:
+                        mode = "momentum"
+                        momentum_threshold = 0.005
+                    elif up_median < -0.005 and down_median > 0.005:
+                        mode = "reversion"
+                        momentum_threshold = -0.005
+
+    return market, {
+        'up_price_min': float(up_price_min) if up_price_min is not None else None,
+        'up_price_max': float(up_price_max) if up_price_max is not None else None,
+        'down_price_min': float(down_price_min) if down_price_min is not None else None,
+        'down_price_max': float(down_price_max) if down_price_max is not None else None,
+        'momentum_window_s': momentum_window_s,
+        'momentum_threshold': momentum_threshold,
+        'mode': mode
+    }
 
 
-def infer_sizing_function(trades: pd.DataFrame) -> Dict[str, Any]:
+def infer_entry_rules(trades: pd.DataFrame, tape: pd.DataFrame,
+                      watch_by_market: Dict[str, pd.DataFrame] = None) -> Dict[str, Any]:
     """
-    Infer sizing function (shares per price bucket x inventory bucket).
-    Uses 2D conditioning: price_bucket x inventory_bucket (low/med/high).
-    
+    Infer entry rules (price bands and momentum/reversion patterns).
+    Optimizes for precision >= 0.90, rejects wide bands, marks as inventory-gated if needed.
+    Markets are processed in parallel.
+
     Args:
         trades: Trade rows dataframe (WATCH trades only)
-        
+        tape: Full price tape dataframe
+        watch_by_market: Optional precomputed per-market split (see
+            split_watch_trades_by_market); computed here if not supplied
+
     Returns:
-        Dictionary with sizing parameters per market
+        Dictionary with entry parameters per market
     """
-    watch_trades = trades[trades['bot'] == 'WATCH'].copy()
-    
-    if len(watch_trades) == 0:
+    if watch_by_market is None:
+        watch_by_market = split_watch_trades_by_market(trades)
+
+    if not watch_by_market:
         return {}
-    
-    size_params = {}
-    
-    for market in watch_trades['market'].unique():
-        market_trades = watch_trades[watch_trades['market'] == market].copy()
-        market_trades = market_trades.sort_values('Timestamp').reset_index(drop=True)
-        
-        if len(market_trades) < 10:  # Need minimum trades
-            continue
-        
-        # Simulate inventory forward to compute imbalance ratio for each trade
-        inventory_up = 0.0
-        inventory_down = 0.0
-        eps = 1e-6
-        
-        inventory_ratios = []
-        for idx, trade in market_trades.iterrows():
-            side = trade['side']
-            shares = trade['shares']
-            
-            # Update inventory
-            if side == 'UP':
-                inventory_up += shares
-            else:
-                inventory_down += shares
-            
-            # Compute imbalance ratio: inv_up / max(inv_down, eps)
-            # This measures how imbalanced we are toward UP
-            max_inv = max(inventory_down, eps)
-            imbalance_ratio = inventory_up / max_inv
-            inventory_ratios.append(imbalance_ratio)
-        
-        market_trades = market_trades.copy()
-        market_trades['inventory_imbalance_ratio'] = inventory_ratios
-        
-        # Create inventory buckets using quantiles (6-8 buckets)
-        # Use quantiles to ensure roughly equal distribution
-        n_inv_buckets = min(8, max(6, len(market_trades) // 20))  # 6-8 buckets
-        if len(inventory_ratios) > n_inv_buckets:
-            quantiles = np.linspace(0, 100, n_inv_buckets + 1)
-            inv_thresholds = np.percentile(inventory_ratios, quantiles)
-            # Ensure thresholds are unique and sorted
-            inv_thresholds = np.unique(inv_thresholds)
-            if len(inv_thresholds) < 2:
-                # Fallback to equal-width bins
-                inv_thresholds = np.linspace(min(inventory_ratios), max(inventory_ratios) + 1e-6, n_inv_buckets + 1)
-        else:
+
+    entry_params = _parallel_per_market(_infer_entry_rules_one_market, watch_by_market.items())
+
+    return {'per_market': entry_params}
+
+
+def _infer_sizing_one_market(market: str, market_trades: pd.DataFrame) -> Tuple[str, Any]:
+    """Infer sizing parameters for a single market (thread-pool worker).
+
+    Expects market_trades already sorted by Timestamp (see
+    split_watch_trades_by_market).
+    """
+    if len(market_trades) < 10:  # Need minimum trades
+        return market, None
+
+    # Simulate inventory forward to compute imbalance ratio for each trade.
+    # Cumulative sums on typed arrays replace the per-row iterrows() walk.
+    eps = 1e-6
+    is_up = (market_trades['side'] == 'UP').to_numpy()
+    shares_arr = market_trades['shares'].to_numpy(dtype=np.float64)
+    inventory_up_cum = np.cumsum(np.where(is_up, shares_arr, 0.0))
+    inventory_down_cum = np.cumsum(np.where(is_up, 0.0, shares_arr))
+
+    # Imbalance ratio: inv_up / max(inv_down, eps)
+    # This measures how imbalanced we are toward UP
+    inventory_ratios = inventory_up_cum / np.maximum(inventory_down_cum, eps)
+
+    market_trades = market_trades.copy()
+    market_trades['inventory_imbalance_ratio'] = inventory_ratios
+    
+    # Create inventory buckets using quantiles (6-8 buckets)
+    # Use quantiles to ensure roughly equal distribution
+    n_inv_buckets = min(8, max(6, len(market_trades) // 20))  # 6-8 buckets
+    if len(inventory_ratios) > n_inv_buckets:
+        quantiles = np.linspace(0, 100, n_inv_buckets + 1)
+        inv_thresholds = np.percentile(inventory_ratios, quantiles)
+        # Ensure thresholds are unique and sorted
+        inv_thresholds = np.unique(inv_thresholds)
+        if len(inv_thresholds) < 2:
             # Fallback to equal-width bins
             inv_thresholds = np.linspace(min(inventory_ratios), max(inventory_ratios) + 1e-6, n_inv_buckets + 1)
-        
-        def get_inventory_bucket(ratio):
-            for i in range(len(inv_thresholds) - 1):
-                if ratio <= inv_thresholds[i + 1]:
-                    return f'bucket_{i}'
-            return f'bucket_{len(inv_thresholds) - 2}'
-        
-        market_trades['inventory_bucket'] = market_trades['inventory_imbalance_ratio'].apply(get_inventory_bucket)
-        inventory_bucket_labels = sorted(market_trades['inventory_bucket'].unique())
-        
-        # Store thresholds for PolicySimulator
-        inv_bucket_thresholds = inv_thresholds.tolist()
-        
-        # Add 2nd conditioning variable: volatility (5s or 30s)
-        volatility_bucket = None
-        size_table_3d = {}
-        
-        # Check if volatility features are available
-        if 'volatility_5s' in market_trades.columns:
-            vol_col = 'volatility_5s'
-        elif 'volatility_30s' in market_trades.columns:
-            vol_col = 'volatility_30s'
-        else:
-            vol_col = None
-        
-        if vol_col is not None and market_trades[vol_col].notna().sum() > len(market_trades) * 0.5:
-            # Create volatility buckets (3-4 buckets)
-            vol_values = market_trades[vol_col].dropna()
-            if len(vol_values) > 3:
-                vol_quantiles = np.linspace(0, 100, 4)  # 3 buckets
-                vol_thresholds = np.percentile(vol_values, vol_quantiles)
-                
-                def get_volatility_bucket(vol):
-                    if pd.isna(vol):
-                        return 'vol_med'
-                    for i in range(len(vol_thresholds) - 1):
-                        if vol <= vol_thresholds[i + 1]:
-                            return f'vol_{i}'  # vol_0, vol_1, vol_2
-                    return 'vol_2'
-                
-                market_trades['volatility_bucket'] = market_trades[vol_col].apply(get_volatility_bucket)
-                volatility_bucket_labels = sorted(market_trades['volatility_bucket'].unique())
-                volatility_bucket = True
-            else:
-                volatility_bucket = False
-        else:
-            volatility_bucket = False
-        
-        # Create price buckets (0-0.05, 0.05-0.10, ..., 0.95-1.00)
-        bin_edges = np.arange(0, 1.05, 0.05)
-        market_trades['price_bucket'] = pd.cut(
-            market_trades['side_px_at_trade'],
-            bins=bin_edges,
-            include_lowest=True
-        )
-        
-        # Build 2D or 3D table: price_bucket x inventory_bucket [x volatility_bucket]
-        # Use median for robustness
-        size_table_2d = {}
-        
-        if volatility_bucket:
-            # Build 3D table: price x inventory x volatility
-            for price_bucket in market_trades['price_bucket'].dropna().unique():
-                for inv_bucket in inventory_bucket_labels:
-                    for vol_bucket in volatility_bucket_labels:
-                        mask = (market_trades['price_bucket'] == price_bucket) & \
-                               (market_trades['inventory_bucket'] == inv_bucket) & \
-                               (market_trades['volatility_bucket'] == vol_bucket)
-                        bucket_trades = market_trades[mask]
-                        
-                        if len(bucket_trades) > 0:
-                            median_shares = bucket_trades['shares'].median()
-                            key = f"{str(price_bucket)}|{inv_bucket}|{vol_bucket}"
-                            size_table_3d[key] = float(median_shares)
+    else:
+        # Fallback to equal-width bins
+        inv_thresholds = np.linspace(min(inventory_ratios), max(inventory_ratios) + 1e-6, n_inv_buckets + 1)
+    
+    def get_inventory_bucket(ratio):
+        for i in range(len(inv_thresholds) - 1):
+            if ratio <= inv_thresholds[i + 1]:
+                return f'bucket_{i}'
+        return f'bucket_{len(inv_thresholds) - 2}'
+    
+    market_trades['inventory_bucket'] = market_trades['inventory_imbalance_ratio'].apply(get_inventory_bucket)
+    inventory_bucket_labels = sorted(market_trades['inventory_bucket'].unique())
+    
+    # Store thresholds for PolicySimulator
+    inv_bucket_thresholds = inv_thresholds.tolist()
+    
+    # Add 2nd conditioning variable: volatility (5s or 30s)
+    volatility_bucket = None
+    size_table_3d = {}
+    
+    # Check if volatility features are available
+    if 'volatility_5s' in market_trades.columns:
+        vol_col = 'volatility_5s'
+    elif 'volatility_30s' in market_trades.columns:
+        vol_col = 'volatility_30s'
+    else:
+        vol_col = None
+    
+    if vol_col is not None and market_trades[vol_col].notna().sum() > len(market_trades) * 0.5:
+        # Create volatility buckets (3-4 buckets)
+        vol_values = market_trades[vol_col].dropna()
+        if len(vol_values) > 3:
+            vol_quantiles = np.linspace(0, 100, 4)  # 3 buckets
+            vol_thresholds = np.percentile(vol_values, vol_quantiles)
             
-            # Also build 2D fallback (price x inventory, ignoring volatility)
-            for price_bucket in market_trades['price_bucket'].dropna().unique():
-                for inv_bucket in inventory_bucket_labels:
-                    mask = (market_trades['price_bucket'] == price_bucket) & \
-                           (market_trades['inventory_bucket'] == inv_bucket)
-                    bucket_trades = market_trades[mask]
-                    
-                    if len(bucket_trades) > 0:
-                        median_shares = bucket_trades['shares'].median()
-                        key = f"{str(price_bucket)}|{inv_bucket}"
-                        size_table_2d[key] = float(median_shares)
+            def get_volatility_bucket(vol):
+                if pd.isna(vol):
+                    return 'vol_med'
+                for i in range(len(vol_thresholds) - 1):
+                    if vol <= vol_thresholds[i + 1]:
+                        return f'vol_{i}'  # vol_0, vol_1, vol_2
+                return 'vol_2'
+            
+            market_trades['volatility_bucket'] = market_trades[vol_col].apply(get_volatility_bucket)
+            volatility_bucket_labels = sorted(market_trades['volatility_bucket'].unique())
+            volatility_bucket = True
         else:
-            # Build 2D table: price x inventory
-            for price_bucket in market_trades['price_bucket'].dropna().unique():
-                for inv_bucket in inventory_bucket_labels:
+            volatility_bucket = False
+    else:
+        volatility_bucket = False
+    
+    # Create price buckets (0-0.05, 0.05-0.10, ..., 0.95-1.00)
+    bin_edges = PRICE_BIN_EDGES
+    market_trades['price_bucket'] = pd.cut(
+        market_trades['side_px_at_trade'],
+        bins=bin_edges,
+        include_lowest=True
+    )
+    
+    # Build 2D or 3D table: price_bucket x inventory_bucket [x volatility_bucket]
+    # Use median for robustness
+    size_table_2d = {}
+    vol_multipliers = None
+
+    def build_2d_table():
+        """Fill size_table_2d with price x inventory medians."""
+        for price_bucket in market_trades['price_bucket'].dropna().unique():
+            for inv_bucket in inventory_bucket_labels:
+                mask = (market_trades['price_bucket'] == price_bucket) & \
+                       (market_trades['inventory_bucket'] == inv_bucket)
+                bucket_trades = market_trades[mask]
+
+                if len(bucket_trades) > 0:
+                    median_shares = bucket_trades['shares'].median()
+                    key = f"{str(price_bucket)}|{inv_bucket}"
+                    size_table_2d[key] = float(median_shares)
+
+    # With ~20 price x 6-8 inventory x 3 volatility cells and a few
+    # thousand trades at most, the full 3D table is usually sparse noise.
+    # Only keep it when enough cells have >= 3 samples; otherwise emit the
+    # compact model: 2D medians x per-volatility scalar multipliers.
+    use_3d = False
+    if volatility_bucket:
+        cell_counts = market_trades.groupby(
+            ['price_bucket', 'inventory_bucket', 'volatility_bucket'], observed=True
+        ).size()
+        use_3d = len(cell_counts) > 0 and float((cell_counts >= 3).mean()) >= 0.3
+
+    if use_3d:
+        # Build 3D table: price x inventory x volatility
+        for price_bucket in market_trades['price_bucket'].dropna().unique():
+            for inv_bucket in inventory_bucket_labels:
+                for vol_bucket in volatility_bucket_labels:
                     mask = (market_trades['price_bucket'] == price_bucket) & \
-                           (market_trades['inventory_bucket'] == inv_bucket)
+                           (market_trades['inventory_bucket'] == inv_bucket) & \
+                           (market_trades['volatility_bucket'] == vol_bucket)
                     bucket_trades = market_trades[mask]
-                    
+
                     if len(bucket_trades) > 0:
                         median_shares = bucket_trades['shares'].median()
-                        key = f"{str(price_bucket)}|{inv_bucket}"
-                        size_table_2d[key] = float(median_shares)
-        
-        # Also create 1D fallback table (price only) for backward compatibility
-        size_table_1d = market_trades.groupby('price_bucket')['shares'].median().to_dict()
-        size_table_1d_str = {str(k): float(v) for k, v in size_table_1d.items() if pd.notna(v)}
-        
-        # Determine conditioning variables
-        conditioning_vars = ['inventory_imbalance_ratio']
+                        key = f"{str(price_bucket)}|{inv_bucket}|{vol_bucket}"
+                        size_table_3d[key] = float(median_shares)
+
+        # Also build 2D fallback (price x inventory, ignoring volatility)
+        build_2d_table()
+    else:
+        # Build 2D table: price x inventory
+        build_2d_table()
+
         if volatility_bucket:
-            conditioning_vars.append('volatility')
-        
-        size_params[market] = {
-            'bin_edges': bin_edges.tolist(),
-            'size_table': size_table_3d if volatility_bucket else size_table_2d,  # 3D or 2D table
-            'size_table_2d': size_table_2d if volatility_bucket else {},  # 2D fallback if 3D
-            'size_table_1d': size_table_1d_str,  # 1D fallback
-            'conditioning_var': conditioning_vars[0] if len(conditioning_vars) == 1 else conditioning_vars,
-            'conditioning_vars': conditioning_vars,  # List of all conditioning vars
-            'inventory_buckets': inventory_bucket_labels,
-            'inventory_bucket_thresholds': inv_bucket_thresholds,  # For PolicySimulator lookup
-            'n_inventory_buckets': len(inventory_bucket_labels),
-            'volatility_buckets': volatility_bucket_labels if volatility_bucket else None,
-            'n_price_buckets': len(bin_edges) - 1,
-            'has_volatility_conditioning': volatility_bucket
-        }
-    
+            # Sparse 3D: per-volatility multipliers relative to the overall
+            # median recover the volatility conditioning cheaply
+            overall_median = market_trades['shares'].median()
+            if pd.notna(overall_median) and overall_median > 0:
+                vol_medians = market_trades.groupby('volatility_bucket', observed=True)['shares'].median()
+                vol_multipliers = {str(v): float(m / overall_median)
+                                   for v, m in vol_medians.items() if pd.notna(m)}
+
+    # Also create 1D fallback table (price only) for backward compatibility
+    size_table_1d = market_trades.groupby('price_bucket')['shares'].median().to_dict()
+    size_table_1d_str = {str(k): float(v) for k, v in size_table_1d.items() if pd.notna(v)}
+    
+    # Determine conditioning variables
+    conditioning_vars = ['inventory_imbalance_ratio']
+    if volatility_bucket:
+        conditioning_vars.append('volatility')
+    
+    return market, {
+        'bin_edges': PRICE_BIN_EDGES_LIST,
+        'size_table': size_table_3d if use_3d else size_table_2d,  # 3D or 2D table
+        'size_table_2d': size_table_2d if use_3d else {},  # 2D fallback if 3D
+        'size_table_1d': size_table_1d_str,  # 1D fallback
+        'conditioning_var': conditioning_vars[0] if len(conditioning_vars) == 1 else conditioning_vars,
+        'conditioning_vars': conditioning_vars,  # List of all conditioning vars
+        'inventory_buckets': inventory_bucket_labels,
+        'inventory_bucket_thresholds': inv_bucket_thresholds,  # For PolicySimulator lookup
+        'n_inventory_buckets': len(inventory_bucket_labels),
+        'volatility_buckets': volatility_bucket_labels if volatility_bucket else None,
+        'volatility_bucket_thresholds': vol_thresholds.tolist() if volatility_bucket else None,
+        'vol_multipliers': vol_multipliers,  # Compact model when 3D is sparse
+        'n_price_buckets': len(bin_edges) - 1,
+        'has_volatility_conditioning': use_3d
+    }
+
+
+def infer_sizing_function(trades: pd.DataFrame,
+                          watch_by_market: Dict[str, pd.DataFrame] = None) -> Dict[str, Any]:
+    """
+    Infer sizing function (shares per price bucket x inventory bucket).
+    Uses 2D conditioning: price_bucket x inventory_bucket (low/med/high).
+    Markets are processed in parallel.
+
+    Args:
+        trades: Trade rows dataframe (WATCH trades only)
+        watch_by_market: Optional precomputed per-market split (see
+            split_watch_trades_by_market); computed here if not supplied
+
+    Returns:
+        Dictionary with sizing parameters per market
+    """
+    if watch_by_market is None:
+        watch_by_market = split_watch_trades_by_market(trades)
+
+    if not watch_by_market:
+        return {}
+
+    size_params = _parallel_per_market(_infer_sizing_one_market, watch_by_market.items())
+
     return {'per_market': size_params}
 
 
-def infer_inventory_behavior(trades: pd.DataFrame) -> Dict[str, Any]:
+def _infer_inventory_one_market(market: str, market_trades: pd.DataFrame) -> Tuple[str, Any]:
+    """Infer inventory parameters for a single market (thread-pool worker).
+
+    Expects market_trades already sorted by Timestamp (see
+    split_watch_trades_by_market).
+    """
+    if len(market_trades) < 10:
+        return market, None
+
+    # Simulate inventory forward on typed arrays (no iterrows). Shares are
+    # strictly positive, so the cumulative inventories are nondecreasing
+    # and running maxima reduce to array maxima.
+    is_up = (market_trades['side'] == 'UP').to_numpy()
+    shares_arr = market_trades['shares'].to_numpy(dtype=np.float64)
+    inventory_up_cum = np.cumsum(np.where(is_up, shares_arr, 0.0))
+    inventory_down_cum = np.cumsum(np.where(is_up, 0.0, shares_arr))
+    total_cum = inventory_up_cum + inventory_down_cum
+
+    max_inventory_up = float(inventory_up_cum.max())
+    max_inventory_down = float(inventory_down_cum.max())
+    max_total = float(total_cum.max())
+
+    # Detect rebalances (buying the smaller side when the imbalance ratio
+    # is extreme, with both sides held)
+    ratio = np.divide(inventory_up_cum, total_cum,
+                      out=np.full_like(total_cum, 0.5), where=total_cum > 0)
+    both_held = (inventory_up_cum > 0) & (inventory_down_cum > 0)
+    rebalance_mask = both_held & (((ratio > 0.7) & ~is_up) | ((ratio < 0.3) & is_up))
+
+    # Infer rebalance ratio (median of rebalance event ratios)
+    rebalance_ratio_R = 0.75  # default
+    if rebalance_mask.any():
+        rebalance_ratio_R = np.median(ratio[rebalance_mask])
+
+    return market, {
+        'rebalance_ratio_R': float(rebalance_ratio_R),
+        'max_up_shares': float(max_inventory_up),
+        'max_down_shares': float(max_inventory_down),
+        'max_total_shares': float(max_total)
+    }
+
+
+def infer_inventory_behavior(trades: pd.DataFrame,
+                             watch_by_market: Dict[str, pd.DataFrame] = None) -> Dict[str, Any]:
     """
     Infer inventory/rebalance behavior from trade sequence.
-    
+    Markets are processed in parallel.
+
     Args:
         trades: Trade rows dataframe (WATCH trades only)
-        
+        watch_by_market: Optional precomputed per-market split (see
+            split_watch_trades_by_market); computed here if not supplied
+
     Returns:
         Dictionary with inventory parameters per market
     """
-    watch_trades = trades[trades['bot'] == 'WATCH'].copy()
-    
-    if len(watch_trades) == 0:
+    if watch_by_market is None:
+        watch_by_market = split_watch_trades_by_market(trades)
+
+    if not watch_by_market:
         return {}
-    
-    inventory_params = {}
-    
-    for market in watch_trades['market'].unique():
-        market_trades = watch_trades[watch_trades['market'] == market].copy()
-        market_trades = market_trades.sort_values('Timestamp').reset_index(drop=True)
-        
-        if len(market_trades) < 10:
-            continue
-        
-        # Simulate inventory forward
-        inventory_up = 0.0
-        inventory_down = 0.0
-        max_inventory_up = 0.0
-        max_inventory_down = 0.0
-        max_total = 0.0
-        
-        rebalance_events = []
-        
-        for idx, trade in market_trades.iterrows():
-            shares = trade['shares']
-            
-            if trade['side'] == 'UP':
-                inventory_up += shares
-            else:
-                inventory_down += shares
-            
-            # Track maxima
-            max_inventory_up = max(max_inventory_up, inventory_up)
-            max_inventory_down = max(max_inventory_down, inventory_down)
-            max_total = max(max_total, inventory_up + inventory_down)
-            
-            # Detect rebalance (buying opposite side when inventory is high)
-            if inventory_up > 0 and inventory_down > 0:
-                ratio = inventory_up / (inventory_up + inventory_down)
-                
-                # If we buy the smaller side when ratio is extreme, it's a rebalance
-                if ratio > 0.7 and trade['side'] == 'DOWN':
-                    rebalance_events.append({
-                        'ratio': ratio,
-                        'timestamp': trade['Timestamp']
-                    })
-                elif ratio < 0.3 and trade['side'] == 'UP':
-                    rebalance_events.append({
-                        'ratio': ratio,
-                        'timestamp': trade['Timestamp']
-                    })
-        
-        # Infer rebalance ratio (median of rebalance event ratios)
-        rebalance_ratio_R = 0.75  # default
-        if rebalance_events:
-            ratios = [e['ratio'] for e in rebalance_events]
-            rebalance_ratio_R = np.median(ratios)
-        
-        inventory_params[market] = {
-            'rebalance_ratio_R': float(rebalance_ratio_R),
-            'max_up_shares': float(max_inventory_up),
-            'max_down_shares': float(max_inventory_down),
-            'max_total_shares': float(max_total)
-        }
-    
+
+    inventory_params = _parallel_per_market(_infer_inventory_one_market, watch_by_market.items())
+
     return {'per_market': inventory_params}
 
 
-def infer_cadence(trades: pd.DataFrame) -> Dict[str, Any]:
+def _infer_cadence_one_market(market: str, market_trades: pd.DataFrame) -> Tuple[str, Any]:
+    """Infer cadence parameters for a single market (thread-pool worker).
+
+    Expects market_trades already sorted by Timestamp (see
+    split_watch_trades_by_market).
+    """
+    if len(market_trades) < 2:
+        return market, None
+
+    # Compute inter-trade times; one np.diff pass on the raw array instead
+    # of the NaN-padded Series diff + dropna chain
+    inter_trade_ms = np.diff(market_trades['Timestamp'].to_numpy()).astype(np.float64)
+
+    min_inter_trade_ms = inter_trade_ms.min()
+    p50_inter_trade_ms = np.median(inter_trade_ms)
+    p95_inter_trade_ms = np.percentile(inter_trade_ms, 95)
+
+    # Compute max trades per second and per minute
+    # Use sliding windows
+    max_trades_per_sec = 0
+    max_trades_per_min = 0
+
+    for start_idx in range(len(market_trades)):
+        start_ts = market_trades.iloc[start_idx]['Timestamp']
+        end_ts_1s = start_ts + 1000
+        end_ts_60s = start_ts + 60000
+
+        count_1s = ((market_trades['Timestamp'] >= start_ts) &
+                   (market_trades['Timestamp'] < end_ts_1s)).sum()
+        count_60s = ((market_trades['Timestamp'] >= start_ts) &
+                    (market_trades['Timestamp'] < end_ts_60s)).sum()
+
+        max_trades_per_sec = max(max_trades_per_sec, count_1s)
+        max_trades_per_min = max(max_trades_per_min, count_60s)
+
+    return market, {
+        'min_inter_trade_ms': float(min_inter_trade_ms),
+        'p50_inter_trade_ms': float(p50_inter_trade_ms),
+        'p95_inter_trade_ms': float(p95_inter_trade_ms),
+        'max_trades_per_sec': int(max_trades_per_sec),
+        'max_trades_per_min': int(max_trades_per_min)
+    }
+
+
+def infer_cadence(trades: pd.DataFrame,
+                  watch_by_market: Dict[str, pd.DataFrame] = None) -> Dict[str, Any]:
     """
     Infer cadence/throttle parameters (inter-trade times, max trades per time window).
-    
+    Markets are processed in parallel.
+
     Args:
         trades: Trade rows dataframe (WATCH trades only)
-        
+        watch_by_market: Optional precomputed per-market split (see
+            split_watch_trades_by_market); computed here if not supplied
+
     Returns:
         Dictionary with cadence parameters per market
     """
-    watch_trades = trades[trades['bot'] == 'WATCH'].copy()
-    
-    if len(watch_trades) == 0:
+    if watch_by_market is None:
+        watch_by_market = split_watch_trades_by_market(trades)
+
+    if not watch_by_market:
         return {}
-    
-    cadence_params = {}
-    
-    for market in watch_trades['market'].unique():
-        market_trades = watch_trades[watch_trades['market'] == market].copy()
-        market_trades = market_trades.sort_values('Timestamp').reset_index(drop=True)
-        
-        if len(market_trades) < 2:
-            continue
-        
-        # Compute inter-trade times
-        inter_trade_times = market_trades['Timestamp'].diff().dropna() / 1000.0  # Convert to seconds
-        
-        min_inter_trade_ms = inter_trade_times.min() * 1000
-        p50_inter_trade_ms = inter_trade_times.median() * 1000
-        p95_inter_trade_ms = inter_trade_times.quantile(0.95) * 1000
-        
-        # Compute max trades per second and per minute
-        # Use sliding windows
-        max_trades_per_sec = 0
-        max_trades_per_min = 0
-        
-        for start_idx in range(len(market_trades)):
-            start_ts = market_trades.iloc[start_idx]['Timestamp']
-            end_ts_1s = start_ts + 1000
-            end_ts_60s = start_ts + 60000
-            
-            count_1s = ((market_trades['Timestamp'] >= start_ts) & 
-                       (market_trades['Timestamp'] < end_ts_1s)).sum()
-            count_60s = ((market_trades['Timestamp'] >= start_ts) & 
-                        (market_trades['Timestamp'] < end_ts_60s)).sum()
-            
-            max_trades_per_sec = max(max_trades_per_sec, count_1s)
-            max_trades_per_min = max(max_trades_per_min, count_60s)
-        
-        cadence_params[market] = {
-            'min_inter_trade_ms': float(min_inter_trade_ms),
-            'p50_inter_trade_ms': float(p50_inter_trade_ms),
-            'p95_inter_trade_ms': float(p95_inter_trade_ms),
-            'max_trades_per_sec': int(max_trades_per_sec),
-            'max_trades_per_min': int(max_trades_per_min)
-        }
-    
+
+    cadence_params = _parallel_per_market(_infer_cadence_one_market, watch_by_market.items())
+
     return {'per_market': cadence_params}
 
 
-def compute_confidence_scores(trades: pd.DataFrame, tape: pd.DataFrame, params: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+def compute_confidence_scores(trades: pd.DataFrame, tape: pd.DataFrame, params: Dict[str, Any],
+                              watch_by_market: Dict[str, pd.DataFrame] = None) -> Dict[str, Dict[str, Any]]:
     """
     Compute confidence scores per market.
-    
+
     Args:
         trades: Trade rows dataframe
         tape: Full price tape dataframe
         params: Inferred parameters
-        
+        watch_by_market: Optional precomputed per-market split (see
+            split_watch_trades_by_market); computed here if not supplied
+
     Returns:
         Dictionary with confidence scores per market
     """
-    watch_trades = trades[trades['bot'] == 'WATCH'].copy()
+    if watch_by_market is None:
+        watch_by_market = split_watch_trades_by_market(trades)
+
     confidence = {}
-    
-    for market in watch_trades['market'].unique():
-        market_trades = watch_trades[watch_trades['market'] == market].copy()
+
+    for market, market_trades in watch_by_market.items():
         n_watch_trades = len(market_trades)
         
         if n_watch_trades < 5:
@@ -532,21 +744,42 @@ def compute_confidence_scores(trades: pd.DataFrame, tape: pd.DataFrame, params:
     return confidence
 
 
-def apply_fallback_logic(params: Dict[str, Any], trades: pd.DataFrame) -> Dict[str, Any]:
+def _clone_param_dict(param_dict: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Clone a flat per-market parameter dict without copy.deepcopy.
+
+    Parameter dicts are flat JSON-serializable structures (floats, strings,
+    lists, small nested dicts), so a shallow re-assembly that copies only
+    the mutable containers is equivalent to deepcopy at a fraction of the
+    cost.
+    """
+    return {
+        key: (dict(value) if isinstance(value, dict)
+              else list(value) if isinstance(value, list)
+              else value)
+        for key, value in param_dict.items()
+    }
+
+
+def apply_fallback_logic(params: Dict[str, Any], trades: pd.DataFrame,
+                         watch_by_market: Dict[str, pd.DataFrame] = None) -> Dict[str, Any]:
     """
     Apply fallback logic: if n_watch_trades < 50, use same asset other timeframe or global.
-    
+
     Args:
         params: Inferred parameters
         trades: Trade rows dataframe (to compute n_watch_trades)
-        
+        watch_by_market: Optional precomputed per-market split (see
+            split_watch_trades_by_market); computed here if not supplied
+
     Returns:
         Parameters with fallbacks applied
     """
-    watch_trades = trades[trades['bot'] == 'WATCH'].copy()
-    
+    if watch_by_market is None:
+        watch_by_market = split_watch_trades_by_market(trades)
+
     # Count trades per market
-    market_counts = watch_trades.groupby('market').size().to_dict()
+    market_counts = {market: len(group) for market, group in watch_by_market.items()}
     
     # Extract asset and timeframe from market key
     # Market keys are like "BTC_15m", "ETH_15m", "BTC_1h", "ETH_1h"
@@ -565,7 +798,7 @@ def apply_fallback_logic(params: Dict[str, Any], trades: pd.DataFrame) -> Dict[s
             else:
                 asset = None
             
-            if '15' in market or '15m' in market:
+            if _is_15m_market(market):
                 timeframe = '15m'
             elif '1h' in market or '1 hour' in market:
                 timeframe = '1h'
@@ -583,7 +816,7 @@ def apply_fallback_logic(params: Dict[str, Any], trades: pd.DataFrame) -> Dict[s
     
     # Compute global parameters (across all markets)
     global_params = {pt: {} for pt in all_param_types}
-    
+
     # For each param type, aggregate across all markets with >= 50 trades
     for param_type in all_param_types:
         per_market = params.get(param_type, {}).get('per_market', {})
@@ -591,66 +824,50 @@ def apply_fallback_logic(params: Dict[str, Any], trades: pd.DataFrame) -> Dict[s
         valid_markets = {m: v for m, v in per_market.items() if market_counts.get(m, 0) >= 50}
         if valid_markets:
             # Use the first valid market's params as global template
-            global_params[param_type] = copy.deepcopy(list(valid_markets.values())[0]) if valid_markets else {}
+            global_params[param_type] = _clone_param_dict(next(iter(valid_markets.values())))
         elif per_market:
             # Fallback: use any available params
-            global_params[param_type] = copy.deepcopy(list(per_market.values())[0]) if per_market else {}
-    
-    # Apply fallbacks
-    result_params = {pt: {'per_market': {}} for pt in all_param_types}
-    result_params['confidence'] = {}
-    
-    # First pass: identify markets that need fallback
-    markets_needing_fallback = []
+            global_params[param_type] = _clone_param_dict(next(iter(per_market.values())))
+
+    # Resolve the fallback source per market once (same asset, other timeframe)
+    fallback_markets = {}
     for market, count in market_counts.items():
-        if count < 50:
-            markets_needing_fallback.append(market)
-    
-    # For each market needing fallback, find fallback source
-    for market in markets_needing_fallback:
+        if count >= 50:
+            continue
         asset, timeframe = get_market_info(market)
-        
-        # Try same asset, other timeframe
-        fallback_market = None
         if asset and timeframe:
             other_timeframe = '1h' if timeframe == '15m' else '15m'
-            fallback_market = f"{asset}_{other_timeframe}"
-        
-        # Apply fallback for each param type
-        for param_type in all_param_types:
-            per_market = params.get(param_type, {}).get('per_market', {})
-            
-            if market in per_market:
-                # Keep existing (will be overwritten if fallback found)
-                result_params[param_type]['per_market'][market] = per_market[market]
-            
-            # Try fallback (deep copy to avoid reference issues)
+            fallback_markets[market] = f"{asset}_{other_timeframe}"
+        else:
+            fallback_markets[market] = None
+
+    # Apply fallbacks in a single pass over param types x markets
+    result_params = {pt: {'per_market': {}} for pt in all_param_types}
+    result_params['confidence'] = {}
+
+    for param_type in all_param_types:
+        per_market = params.get(param_type, {}).get('per_market', {})
+        result_per_market = result_params[param_type]['per_market']
+
+        for market in set(per_market) | set(market_counts):
+            if market not in fallback_markets:
+                # Enough trades (or unknown count): keep own parameters
+                if market in per_market:
+                    result_per_market[market] = _clone_param_dict(per_market[market])
+                continue
+
+            fallback_market = fallback_markets[market]
             if fallback_market and fallback_market in per_market:
-                result_params[param_type]['per_market'][market] = copy.deepcopy(per_market[fallback_market])
+                result_per_market[market] = _clone_param_dict(per_market[fallback_market])
                 print(f"  Applied fallback for {market}: using {fallback_market} for {param_type}")
             elif global_params.get(param_type):
                 # Use global fallback
-                result_params[param_type]['per_market'][market] = copy.deepcopy(global_params[param_type])
+                result_per_market[market] = _clone_param_dict(global_params[param_type])
                 print(f"  Applied global fallback for {market} for {param_type}")
             elif market in per_market:
                 # Keep existing (no fallback available)
-                result_params[param_type]['per_market'][market] = copy.deepcopy(per_market[market])
-    
-    # For markets with enough trades, use their own parameters
-    for market, count in market_counts.items():
-        if count >= 50:
-            for param_type in all_param_types:
-                per_market = params.get(param_type, {}).get('per_market', {})
-                if market in per_market:
-                    result_params[param_type]['per_market'][market] = copy.deepcopy(per_market[market])
-    
-    # Also copy over markets that weren't in markets_needing_fallback but exist in params
-    for param_type in all_param_types:
-        per_market = params.get(param_type, {}).get('per_market', {})
-        for market in per_market:
-            if market not in result_params[param_type]['per_market']:
-                result_params[param_type]['per_market'][market] = copy.deepcopy(per_market[market])
-    
+                result_per_market[market] = _clone_param_dict(per_market[market])
+
     return result_params
 
 
@@ -691,234 +908,243 @@ def transform_params_to_market_format(params: Dict[str, Any]) -> Dict[str, Any]:
         'risk_params', 'unwind_params', 'reset_params', 'quality_filter_params'
     ]
     
-    # Collect all markets from all param types
-    all_markets = set()
-    for param_type in all_param_types:
-        per_market = params.get(param_type, {}).get('per_market', {})
-        all_markets.update(per_market.keys())
-    
-    # Also get markets from confidence
+    # Resolve the per-market views once instead of re-walking the chained
+    # params.get(...).get('per_market', {}) lookups for every market
+    per_market_views = {pt: params.get(pt, {}).get('per_market', {}) for pt in all_param_types}
     confidence = params.get('confidence', {}).get('per_market', {})
-    all_markets.update(confidence.keys())
-    
-    # Build market-first structure
+
+    # Collect all markets from all param types (and confidence)
+    all_markets = set(confidence)
+    for per_market in per_market_views.values():
+        all_markets.update(per_market)
+
+    # Build market-first structure in a single transpose pass
     result = {}
     for market in all_markets:
-        result[market] = {
-            'entry_params': params.get('entry_params', {}).get('per_market', {}).get(market, {}),
-            'size_params': params.get('size_params', {}).get('per_market', {}).get(market, {}),
-            'inventory_params': params.get('inventory_params', {}).get('per_market', {}).get(market, {}),
-            'cadence_params': params.get('cadence_params', {}).get('per_market', {}).get(market, {}),
-            'side_selection_params': params.get('side_selection_params', {}).get('per_market', {}).get(market, {}),
-            'execution_params': params.get('execution_params', {}).get('per_market', {}).get(market, {}),
-            'cooldown_params': params.get('cooldown_params', {}).get('per_market', {}).get(market, {}),
-            'risk_params': params.get('risk_params', {}).get('per_market', {}).get(market, {}),
-            'unwind_params': params.get('unwind_params', {}).get('per_market', {}).get(market, {}),
-            'reset_params': params.get('reset_params', {}).get('per_market', {}).get(market, {}),
-            'quality_filter_params': params.get('quality_filter_params', {}).get('per_market', {}).get(market, {}),
-            'confidence': confidence.get(market, {})
-        }
-    
+        market_params = {pt: per_market_views[pt].get(market, {}) for pt in all_param_types}
+        market_params['confidence'] = confidence.get(market, {})
+        result[market] = market_params
+
     return result
 
 
-def infer_side_selection(trades: pd.DataFrame, tape: pd.DataFrame) -> Dict[str, Any]:
-    """
-    Infer side selection rule when both UP and DOWN satisfy entry conditions.
-    
-    Analyzes patterns to determine if WATCH uses:
-    - inventory-driven (buy side with lower inventory ratio)
-    - better edge (distance from 0.5)
-    - alternating pattern
-    - fixed preference
-    
-    Args:
-        trades: Trade rows dataframe (WATCH trades only)
-        tape: Full price tape dataframe
-        
-    Returns:
-        Dictionary with side selection parameters per market
+def _infer_side_selection_one_market(market: str, market_trades: pd.DataFrame) -> Tuple[str, Any]:
+    """Infer side-selection parameters for a single market (thread-pool worker).
+
+    Expects market_trades already sorted by Timestamp (see
+    split_watch_trades_by_market).
     """
-    watch_trades = trades[trades['bot'] == 'WATCH'].copy()
-    
-    if len(watch_trades) == 0:
-        return {}
-    
-    side_selection_params = {}
-    
-    for market in watch_trades['market'].unique():
-        market_trades = watch_trades[watch_trades['market'] == market].copy()
-        market_trades = market_trades.sort_values('Timestamp').reset_index(drop=True)
-        
-        if len(market_trades) < 20:  # Need minimum trades for pattern analysis
-            continue
-        
-        # Simulate inventory to analyze patterns
-        inventory_up = 0.0
-        inventory_down = 0.0
-        
-        # Track instances where both UP and DOWN would be valid
-        # (We'll need to infer this from nearby price tape entries)
-        both_valid_instances = []
-        selected_side = []
-        inventory_ratios = []
-        edge_distances = []
-        
-        # Analyze pattern from actual trades
-        # Pattern 1: Check if trades alternate
-        sides = market_trades['side'].values
-        alternation_score = 0.0
-        if len(sides) > 1:
-            alternations = sum(1 for i in range(1, len(sides)) if sides[i] != sides[i-1])
-            alternation_score = alternations / (len(sides) - 1) if len(sides) > 1 else 0.0
-        
-        # Pattern 2: Check inventory-driven behavior
-        inventory_driven_evidence = []
-        for idx, trade in market_trades.iterrows():
-            side = trade['side']
-            shares = trade['shares']
-            
-            # Update inventory
-            if side == 'UP':
-                inventory_up += shares
-            else:
-                inventory_down += shares
-            
-            total_inv = inventory_up + inventory_down
-            if total_inv > 0:
-                inv_ratio_up = inventory_up / total_inv
-                inv_ratio_down = inventory_down / total_inv
-                
-                # If buying the side with lower inventory ratio, it's inventory-driven
-                if side == 'UP' and inv_ratio_up < 0.5:
-                    inventory_driven_evidence.append(1)
-                elif side == 'DOWN' and inv_ratio_down < 0.5:
-                    inventory_driven_evidence.append(1)
-                else:
-                    inventory_driven_evidence.append(0)
-        
-        inventory_driven_score = np.mean(inventory_driven_evidence) if inventory_driven_evidence else 0.0
-        
-        # Pattern 3: Check edge-driven (distance from 0.5)
-        edge_driven_evidence = []
-        for idx, trade in market_trades.iterrows():
-            side_px = trade.get('side_px_at_trade', np.nan)
-            if pd.notna(side_px):
-                distance_from_50 = abs(side_px - 0.5)
-                # Lower distance = better edge (closer to fair value)
-                # If trading at prices closer to 0.5, it's edge-driven
-                if distance_from_50 < 0.1:  # Within 10% of 0.5
-                    edge_driven_evidence.append(1)
-                else:
-                    edge_driven_evidence.append(0)
-        
-        edge_driven_score = np.mean(edge_driven_evidence) if edge_driven_evidence else 0.0
-        
-        # Pattern 4: Price-momentum driven (buying the side with rising price)
-        momentum_driven_evidence = []
-        if 'delta_5s_side_px' in market_trades.columns:
-            for idx, trade in market_trades.iterrows():
-                side = trade['side']
-                delta_5s = trade.get('delta_5s_side_px', np.nan)
-                
-                if pd.notna(delta_5s):
-                    # If buying UP when UP price is rising (positive delta), it's momentum-driven
-                    # If buying DOWN when DOWN price is rising (negative delta of UP = DOWN rising), it's momentum-driven
-                    if side == 'UP' and delta_5s > 0.001:  # UP price rising
-                        momentum_driven_evidence.append(1)
-                    elif side == 'DOWN' and delta_5s < -0.001:  # DOWN price rising (UP falling)
-                        momentum_driven_evidence.append(1)
-                    else:
-                        momentum_driven_evidence.append(0)
-        
-        momentum_driven_score = np.mean(momentum_driven_evidence) if momentum_driven_evidence else 0.0
-        
-        # Pattern 5: Check if accumulating on losing side (ANTI-PATTERN to detect)
-        # This detects if more trades are on the side that's underwater (price below average)
-        losing_side_accumulation = 0.0
-        up_trades = market_trades[market_trades['side'] == 'UP']
-        down_trades = market_trades[market_trades['side'] == 'DOWN']
-        
-        if len(up_trades) > 5 and len(down_trades) > 5:
-            up_avg_price = up_trades['Price UP ($)'].mean()
-            down_avg_price = down_trades['Price DOWN ($)'].mean()
-            
-            # Get recent prices (last 20% of trades)
-            recent_up_trades = up_trades.tail(max(1, len(up_trades) // 5))
-            recent_down_trades = down_trades.tail(max(1, len(down_trades) // 5))
-            
-            if len(recent_up_trades) > 0 and len(recent_down_trades) > 0:
-                recent_up_price = recent_up_trades['Price UP ($)'].mean()
-                recent_down_price = recent_down_trades['Price DOWN ($)'].mean()
-                
-                # Check if UP side is losing (recent price < avg) but has more trades
-                up_is_losing = recent_up_price < up_avg_price * 0.95
-                down_is_losing = recent_down_price < down_avg_price * 0.95
-                
-                if up_is_losing and len(up_trades) > len(down_trades) * 1.2:
-                    losing_side_accumulation = len(up_trades) / len(market_trades)
-                elif down_is_losing and len(down_trades) > len(up_trades) * 1.2:
-                    losing_side_accumulation = len(down_trades) / len(market_trades)
-        
-        # Pattern 6: Fixed preference (check if one side dominates)
-        up_count = (market_trades['side'] == 'UP').sum()
-        down_count = (market_trades['side'] == 'DOWN').sum()
-        total_count = len(market_trades)
-        up_ratio = up_count / total_count if total_count > 0 else 0.5
-        fixed_preference_score = max(up_ratio, 1 - up_ratio)  # Higher = more skewed
-        
-        # Determine mode by choosing highest score
-        # Don't hardcode "inventory_driven" - use the actual highest score
-        scores = {
-            'inventory_driven': inventory_driven_score,
-            'alternating': alternation_score,
-            'edge_driven': edge_driven_score,
-            'momentum_driven': momentum_driven_score,
-            'fixed_preference': fixed_preference_score
-        }
-        
-        # Sort by score descending
-        sorted_scores = sorted(scores.items(), key=lambda x: x[1], reverse=True)
-        top_mode, top_score = sorted_scores[0]
-        second_score = sorted_scores[1][1] if len(sorted_scores) > 1 else 0.0
-        
-        # Compute confidence gap
-        confidence_gap = top_score - second_score
-        
-        # If gap < 0.1, set mode="mixed" (fall back to inventory-first in policy)
-        if confidence_gap < 0.1:
-            mode = "mixed"
-        else:
-            mode = top_mode
-        
-        # Handle fixed_preference mode
-        preferred_side = None
-        if mode == "fixed_preference":
-            preferred_side = "UP" if up_ratio > 0.5 else "DOWN"
-        
-        side_selection_params[market] = {
-            'mode': mode,
-            'inventory_driven_score': float(inventory_driven_score),
-            'alternation_score': float(alternation_score),
-            'edge_driven_score': float(edge_driven_score),
-            'momentum_driven_score': float(momentum_driven_score),
-            'fixed_preference_score': float(fixed_preference_score),
-            'confidence_gap': float(confidence_gap),
-            'losing_side_accumulation': float(losing_side_accumulation),  # Warning flag
-            'preferred_side': preferred_side
-        }
-        
-        # Print warning if accumulating on losing side
-        if losing_side_accumulation > 0.55:  # More than 55% of trades on losing side
-            print(f"  ⚠️  WARNING: {market} appears to accumulate on losing side ({losing_side_accumulation:.1%} of trades)")
-            print(f"     This suggests side selection may not be price-aware (not profit-maximizing)")
+    if len(market_trades) < 20:  # Need minimum trades for pattern analysis
+        return market, None
+
+    # Extract columns once as typed arrays and score all four patterns
+    # in a single numba-compiled pass:
+    # Pattern 1: alternation between sides
+    # Pattern 2: inventory-driven (buying the side with lower inventory ratio)
+    # Pattern 3: edge-driven (trading within 10% of fair value 0.5)
+    # Pattern 4: momentum-driven (buying the side with rising price)
+    # Compare on the Series (int8 code compare for categorical side), then
+    # drop to a numpy bool array
+    is_up = (market_trades['side'] == 'UP').to_numpy()
+    shares_arr = market_trades['shares'].to_numpy(dtype=np.float64)
+    if 'side_px_at_trade' in market_trades.columns:
+        side_px_arr = market_trades['side_px_at_trade'].to_numpy(dtype=np.float64)
+    else:
+        side_px_arr = np.full(len(market_trades), np.nan)
+    if 'delta_5s_side_px' in market_trades.columns:
+        delta_arr = market_trades['delta_5s_side_px'].to_numpy(dtype=np.float64)
+    else:
+        delta_arr = np.full(len(market_trades), np.nan)
+
+    (inventory_driven_score, alternation_score,
+     edge_driven_score, momentum_driven_score) = _score_side_selection(
+        is_up, shares_arr, side_px_arr, delta_arr)
+
+    # Pattern 5: Check if accumulating on losing side (ANTI-PATTERN to detect)
+    # This detects if more trades are on the side that's underwater (price below average)
+    losing_side_accumulation = 0.0
+    up_trades = market_trades[market_trades['side'] == 'UP']
+    down_trades = market_trades[market_trades['side'] == 'DOWN']
+
+    if len(up_trades) > 5 and len(down_trades) > 5:
+        up_avg_price = up_trades['Price UP ($)'].mean()
+        down_avg_price = down_trades['Price DOWN ($)'].mean()
+
+        # Get recent prices (last 20% of trades)
+        recent_up_trades = up_trades.tail(max(1, len(up_trades) // 5))
+        recent_down_trades = down_trades.tail(max(1, len(down_trades) // 5))
+
+        if len(recent_up_trades) > 0 and len(recent_down_trades) > 0:
+            recent_up_price = recent_up_trades['Price UP ($)'].mean()
+            recent_down_price = recent_down_trades['Price DOWN ($)'].mean()
+
+            # Check if UP side is losing (recent price < avg) but has more trades
+            up_is_losing = recent_up_price < up_avg_price * 0.95
+            down_is_losing = recent_down_price < down_avg_price * 0.95
+
+            if up_is_losing and len(up_trades) > len(down_trades) * 1.2:
+                losing_side_accumulation = len(up_trades) / len(market_trades)
+            elif down_is_losing and len(down_trades) > len(up_trades) * 1.2:
+                losing_side_accumulation = len(down_trades) / len(market_trades)
+
+    # Pattern 6: Fixed preference (check if one side dominates)
+    up_count = (market_trades['side'] == 'UP').sum()
+    down_count = (market_trades['side'] == 'DOWN').sum()
+    total_count = len(market_trades)
+    up_ratio = up_count / total_count if total_count > 0 else 0.5
+    fixed_preference_score = max(up_ratio, 1 - up_ratio)  # Higher = more skewed
+
+    # Determine mode by choosing highest score
+    # Don't hardcode "inventory_driven" - use the actual highest score
+    scores = {
+        'inventory_driven': inventory_driven_score,
+        'alternating': alternation_score,
+        'edge_driven': edge_driven_score,
+        'momentum_driven': momentum_driven_score,
+        'fixed_preference': fixed_preference_score
+    }
+
+    # Top-2 selection with a running (best, second) pair; only the two
+    # highest scores matter, so no sorted tuple list is needed
+    top_mode = None
+    top_score = -np.inf
+    second_score = -np.inf
+    for mode_name, score in scores.items():
+        if score > top_score:
+            second_score = top_score
+            top_mode, top_score = mode_name, score
+        elif score > second_score:
+            second_score = score
+
+    # Compute confidence gap
+    confidence_gap = top_score - second_score
+
+    # If gap < 0.1, set mode="mixed" (fall back to inventory-first in policy)
+    if confidence_gap < 0.1:
+        mode = "mixed"
+    else:
+        mode = top_mode
+
+    # Handle fixed_preference mode
+    preferred_side = None
+    if mode == "fixed_preference":
+        preferred_side = "UP" if up_ratio > 0.5 else "DOWN"
+
+    params = {
+        'mode': mode,
+        'inventory_driven_score': float(inventory_driven_score),
+        'alternation_score': float(alternation_score),
+        'edge_driven_score': float(edge_driven_score),
+        'momentum_driven_score': float(momentum_driven_score),
+        'fixed_preference_score': float(fixed_preference_score),
+        'confidence_gap': float(confidence_gap),
+        'losing_side_accumulation': float(losing_side_accumulation),  # Warning flag
+        'preferred_side': preferred_side
+    }
+
+    # Print warning if accumulating on losing side
+    if losing_side_accumulation > 0.55:  # More than 55% of trades on losing side
+        print(f"  ⚠️  WARNING: {market} appears to accumulate on losing side ({losing_side_accumulation:.1%} of trades)")
+        print(f"     This suggests side selection may not be price-aware (not profit-maximizing)")
+
+    return market, params
+
+
+def infer_side_selection(trades: pd.DataFrame, tape: pd.DataFrame,
+                         watch_by_market: Dict[str, pd.DataFrame] = None) -> Dict[str, Any]:
+    """
+    Infer side selection rule when both UP and DOWN satisfy entry conditions.
+    Markets are processed in parallel.
     
+    Analyzes patterns to determine if WATCH uses:
+    - inventory-driven (buy side with lower inventory ratio)
+    - better edge (distance from 0.5)
+    - alternating pattern
+    - fixed preference
+    
+    Args:
+        trades: Trade rows dataframe (WATCH trades only)
+        tape: Full price tape dataframe
+        watch_by_market: Optional precomputed per-market split (see
+            split_watch_trades_by_market); computed here if not supplied
+        
+    Returns:
+        Dictionary with side selection parameters per market
+    """
+    if watch_by_market is None:
+        watch_by_market = split_watch_trades_by_market(trades)
+
+    if not watch_by_market:
+        return {}
+
+    side_selection_params = _parallel_per_market(_infer_side_selection_one_market, watch_by_market.items())
+
     return {'per_market': side_selection_params}
 
 
-def infer_execution_model(trades: pd.DataFrame, tape: pd.DataFrame) -> Dict[str, Any]:
+def _infer_execution_one_market(market: str, market_trades: pd.DataFrame) -> Tuple[str, Any]:
+    """Infer execution-model parameters for a single market (thread-pool worker).
+
+    Expects market_trades already sorted by Timestamp (see
+    split_watch_trades_by_market).
+    """
+    if len(market_trades) < 10:
+        return market, None
+
+    # Compute fill bias: fill_px - snapshot_side_px
+    # (columnar access; the per-row trade.get calls boxed a Series each)
+    if 'fill_px' not in market_trades.columns or 'side_px_at_trade' not in market_trades.columns:
+        return market, None
+
+    fill_px = market_trades['fill_px'].to_numpy(dtype=np.float64)
+    side_px = market_trades['side_px_at_trade'].to_numpy(dtype=np.float64)
+
+    # Subtract, NaN-mask and compute all five bias statistics in one
+    # compiled pass (no boolean-mask or fancy-index intermediates)
+    stats = _fill_bias_stats(fill_px, side_px)
+
+    if int(stats[0]) == 0:
+        return market, None
+
+    mean_bias, std_bias, p25_bias, median_bias, p75_bias = (
+        float(v) for v in stats[1:])
+
+    # Determine execution model
+    # If bias is close to 0, it's at snapshot price
+    # If bias has small positive offset, it might be mid-price or fixed slippage
+    # If bias varies widely, it might be worst-case (cross spread)
+
+    model_type = "snapshot_price"  # default
+    slippage_offset = 0.0
+
+    if abs(median_bias) < 0.001:  # Very close to 0
+        model_type = "snapshot_price"
+    elif abs(median_bias) < 0.01 and std_bias < 0.01:  # Small, consistent offset
+        model_type = "fixed_slippage"
+        slippage_offset = median_bias
+    elif std_bias > 0.05:  # High variance
+        model_type = "worst_case"  # Cross spread, variable
+    else:
+        model_type = "mid_price"  # Assumed to be mid
+
+    params = {
+        'model_type': model_type,
+        'fill_bias_median': median_bias,
+        'fill_bias_mean': mean_bias,
+        'fill_bias_std': std_bias,
+        'fill_bias_p25': p25_bias,
+        'fill_bias_p75': p75_bias,
+        'slippage_offset': slippage_offset
+    }
+
+    return market, params
+
+
+def infer_execution_model(trades: pd.DataFrame, tape: pd.DataFrame,
+                          watch_by_market: Dict[str, pd.DataFrame] = None) -> Dict[str, Any]:
     """
     Infer execution/fill price model (how fill_px relates to snapshot prices).
+    Markets are processed in parallel.
     
     Computes fill_bias = fill_px - snapshot_side_px to determine:
     - at snapshot price (bias ~ 0)
@@ -929,79 +1155,88 @@ def infer_execution_model(trades: pd.DataFrame, tape: pd.DataFrame) -> Dict[str,
     Args:
         trades: Trade rows dataframe (WATCH trades only)
         tape: Full price tape dataframe
+        watch_by_market: Optional precomputed per-market split (see
+            split_watch_trades_by_market); computed here if not supplied
         
     Returns:
         Dictionary with execution model parameters per market
     """
-    watch_trades = trades[trades['bot'] == 'WATCH'].copy()
-    
-    if len(watch_trades) == 0:
+    if watch_by_market is None:
+        watch_by_market = split_watch_trades_by_market(trades)
+
+    if not watch_by_market:
         return {}
-    
-    execution_params = {}
-    
-    for market in watch_trades['market'].unique():
-        market_trades = watch_trades[watch_trades['market'] == market].copy()
-        
-        if len(market_trades) < 10:
-            continue
-        
-        # Compute fill bias: fill_px - snapshot_side_px
-        fill_biases = []
-        for idx, trade in market_trades.iterrows():
-            fill_px = trade.get('fill_px', np.nan)
-            side_px = trade.get('side_px_at_trade', np.nan)
-            
-            if pd.notna(fill_px) and pd.notna(side_px):
-                bias = fill_px - side_px
-                fill_biases.append(bias)
-        
-        if len(fill_biases) == 0:
-            continue
-        
-        fill_biases = np.array(fill_biases)
-        
-        # Analyze bias distribution
-        median_bias = float(np.median(fill_biases))
-        mean_bias = float(np.mean(fill_biases))
-        std_bias = float(np.std(fill_biases))
-        p25_bias = float(np.percentile(fill_biases, 25))
-        p75_bias = float(np.percentile(fill_biases, 75))
-        
-        # Determine execution model
-        # If bias is close to 0, it's at snapshot price
-        # If bias has small positive offset, it might be mid-price or fixed slippage
-        # If bias varies widely, it might be worst-case (cross spread)
-        
-        model_type = "snapshot_price"  # default
-        slippage_offset = 0.0
-        
-        if abs(median_bias) < 0.001:  # Very close to 0
-            model_type = "snapshot_price"
-        elif abs(median_bias) < 0.01 and std_bias < 0.01:  # Small, consistent offset
-            model_type = "fixed_slippage"
-            slippage_offset = median_bias
-        elif std_bias > 0.05:  # High variance
-            model_type = "worst_case"  # Cross spread, variable
-        else:
-            model_type = "mid_price"  # Assumed to be mid
-        
-        execution_params[market] = {
-            'model_type': model_type,
-            'fill_bias_median': median_bias,
-            'fill_bias_mean': mean_bias,
-            'fill_bias_std': std_bias,
-            'fill_bias_p25': p25_bias,
-            'fill_bias_p75': p75_bias,
-            'slippage_offset': slippage_offset
-        }
-    
+
+    execution_params = _parallel_per_market(_infer_execution_one_market, watch_by_market.items())
+
     return {'per_market': execution_params}
 
 
-def infer_cooldown_rules(trades: pd.DataFrame, tape: pd.DataFrame) -> Dict[str, Any]:
+def _infer_cooldown_one_market(market: str, market_trades: pd.DataFrame) -> Tuple[str, Any]:
+    """Infer cooldown parameters for a single market (thread-pool worker).
+
+    Expects market_trades already sorted by Timestamp (see
+    split_watch_trades_by_market).
+    """
+    if len(market_trades) < 10:
+        return market, None
+
+    # Pattern 1: Time-based cooldown after each trade (np.diff on the raw
+    # array; no NaN-padded intermediate Series)
+    inter_trade_times = np.diff(market_trades['Timestamp'].to_numpy()) * 0.001  # seconds
+    min_inter_trade = float(inter_trade_times.min()) if len(inter_trade_times) > 0 else 0.0
+    median_inter_trade = float(np.median(inter_trade_times)) if len(inter_trade_times) > 0 else 0.0
+
+    # Detect if there's a consistent minimum pause
+    # If median is much higher than min, there might be a cooldown
+    has_time_cooldown = median_inter_trade > min_inter_trade * 1.5 and median_inter_trade > 1.0
+    time_cooldown_seconds = median_inter_trade * 0.5 if has_time_cooldown else 0.0  # Conservative estimate
+
+    # Pattern 2: Price move-based cooldown
+    # Check if trades only happen after price moves significantly
+    price_move_threshold = None
+    if 'delta_5s_side_px' in market_trades.columns:
+        valid_deltas = market_trades['delta_5s_side_px'].dropna().abs()
+        if len(valid_deltas) > 0:
+            # If most trades happen after price moves, infer threshold
+            median_price_move = float(valid_deltas.median())
+            if median_price_move > 0.01:  # At least 1% move
+                price_move_threshold = median_price_move * 0.5  # Conservative threshold
+
+    # Pattern 3: Inventory-based lockout
+    # Check if trading stops during extreme inventory imbalance
+    # (cumulative-sum inventory simulation, no per-row loop)
+    # Compare on the Series (int8 code compare for categorical side), then
+    # drop to a numpy bool array
+    is_up = (market_trades['side'] == 'UP').to_numpy()
+    shares_arr = market_trades['shares'].to_numpy(dtype=np.float64)
+    inv_up = np.cumsum(np.where(is_up, shares_arr, 0.0))
+    inv_down = np.cumsum(np.where(is_up, 0.0, shares_arr))
+    total = inv_up + inv_down
+    held = total > 0
+    # If the ratio is extreme and we're not rebalancing, might be lockout
+    lockout_ratios = np.maximum(inv_up, inv_down)[held] / total[held]
+    n_lockout_events = int(np.count_nonzero(lockout_ratios > 0.9))
+
+    has_inventory_lockout = n_lockout_events > len(market_trades) * 0.2
+    inventory_lockout_threshold = 0.85 if has_inventory_lockout else None
+
+    params = {
+        'has_time_cooldown': has_time_cooldown,
+        'time_cooldown_seconds': float(time_cooldown_seconds),
+        'price_move_threshold': float(price_move_threshold) if price_move_threshold is not None else None,
+        'has_inventory_lockout': has_inventory_lockout,
+        'inventory_lockout_threshold': float(inventory_lockout_threshold) if inventory_lockout_threshold is not None else None
+    }
+
+    return market, params
+
+
+def infer_cooldown_rules(trades: pd.DataFrame, tape: pd.DataFrame,
+                         watch_by_market: Dict[str, pd.DataFrame] = None) -> Dict[str, Any]:
     """
     Infer cooldown/lockout rules (pauses after trades).
+    Markets are processed in parallel.
     
     Analyzes patterns to determine if WATCH pauses:
     - after each trade (time-based)
@@ -1011,86 +1246,84 @@ def infer_cooldown_rules(trades: pd.DataFrame, tape: pd.DataFrame) -> Dict[str,
     Args:
         trades: Trade rows dataframe (WATCH trades only)
         tape: Full price tape dataframe
+        watch_by_market: Optional precomputed per-market split (see
+            split_watch_trades_by_market); computed here if not supplied
         
     Returns:
         Dictionary with cooldown parameters per market
     """
-    watch_trades = trades[trades['bot'] == 'WATCH'].copy()
-    
-    if len(watch_trades) == 0:
+    if watch_by_market is None:
+        watch_by_market = split_watch_trades_by_market(trades)
+
+    if not watch_by_market:
         return {}
-    
-    cooldown_params = {}
-    
-    for market in watch_trades['market'].unique():
-        market_trades = watch_trades[watch_trades['market'] == market].copy()
-        market_trades = market_trades.sort_values('Timestamp').reset_index(drop=True)
-        market_tape = tape[tape['market'] == market].copy()
-        market_tape = market_tape.sort_values('Timestamp').reset_index(drop=True)
-        
-        if len(market_trades) < 10:
-            continue
-        
-        # Pattern 1: Time-based cooldown after each trade
-        inter_trade_times = market_trades['Timestamp'].diff().dropna() / 1000.0  # seconds
-        min_inter_trade = float(inter_trade_times.min()) if len(inter_trade_times) > 0 else 0.0
-        median_inter_trade = float(inter_trade_times.median()) if len(inter_trade_times) > 0 else 0.0
-        
-        # Detect if there's a consistent minimum pause
-        # If median is much higher than min, there might be a cooldown
-        has_time_cooldown = median_inter_trade > min_inter_trade * 1.5 and median_inter_trade > 1.0
-        time_cooldown_seconds = median_inter_trade * 0.5 if has_time_cooldown else 0.0  # Conservative estimate
-        
-        # Pattern 2: Price move-based cooldown
-        # Check if trades only happen after price moves significantly
-        price_move_threshold = None
-        if 'delta_5s_side_px' in market_trades.columns:
-            valid_deltas = market_trades['delta_5s_side_px'].dropna().abs()
-            if len(valid_deltas) > 0:
-                # If most trades happen after price moves, infer threshold
-                median_price_move = float(valid_deltas.median())
-                if median_price_move > 0.01:  # At least 1% move
-                    price_move_threshold = median_price_move * 0.5  # Conservative threshold
-        
-        # Pattern 3: Inventory-based lockout
-        # Check if trading stops during extreme inventory imbalance
-        inventory_up = 0.0
-        inventory_down = 0.0
-        inventory_lockout_events = []
-        
-        for idx, trade in market_trades.iterrows():
-            side = trade['side']
-            shares = trade['shares']
-            
-            if side == 'UP':
-                inventory_up += shares
-            else:
-                inventory_down += shares
-            
-            total = inventory_up + inventory_down
-            if total > 0:
-                ratio = max(inventory_up, inventory_down) / total
-                # If ratio is extreme and we're not rebalancing, might be lockout
-                if ratio > 0.9:
-                    inventory_lockout_events.append(ratio)
-        
-        has_inventory_lockout = len(inventory_lockout_events) > len(market_trades) * 0.2
-        inventory_lockout_threshold = 0.85 if has_inventory_lockout else None
-        
-        cooldown_params[market] = {
-            'has_time_cooldown': has_time_cooldown,
-            'time_cooldown_seconds': float(time_cooldown_seconds),
-            'price_move_threshold': float(price_move_threshold) if price_move_threshold is not None else None,
-            'has_inventory_lockout': has_inventory_lockout,
-            'inventory_lockout_threshold': float(inventory_lockout_threshold) if inventory_lockout_threshold is not None else None
-        }
-    
+
+    cooldown_params = _parallel_per_market(_infer_cooldown_one_market, watch_by_market.items())
+
     return {'per_market': cooldown_params}
 
 
-def infer_risk_limits(trades: pd.DataFrame) -> Dict[str, Any]:
+def _infer_risk_one_market(market: str, market_trades: pd.DataFrame) -> Tuple[str, Any]:
+    """Infer risk-limit parameters for a single market (thread-pool worker).
+
+    Expects market_trades already sorted by Timestamp (see
+    split_watch_trades_by_market).
+    """
+    if len(market_trades) < 10:
+        return market, None
+
+    # Infer max trades per session
+    # Group trades by time windows (sessions could be 15-min windows or 1-hour windows)
+    # For 15m markets, session = 15 minutes; for 1h markets, session = 1 hour
+    is_15m = _is_15m_market(market)
+
+    # Determine session length
+    if is_15m:
+        session_ms = 15 * 60 * 1000  # 15 minutes
+    else:
+        session_ms = 60 * 60 * 1000  # 1 hour
+
+    # Count trades per session; sessions are dense integer bins, so
+    # np.bincount over offset bin indices replaces the groupby hash table
+    session_idx = (market_trades['Timestamp'].to_numpy() // session_ms).astype(np.int64)
+    session_counts = np.bincount(session_idx - session_idx.min())
+    max_trades_per_session = int(session_counts.max()) if len(session_counts) > 0 else None
+
+    # Infer max inventory imbalance
+    # (cumulative-sum inventory simulation, no per-row loop)
+    # Compare on the Series (int8 code compare for categorical side), then
+    # drop to a numpy bool array
+    is_up = (market_trades['side'] == 'UP').to_numpy()
+    shares_arr = market_trades['shares'].to_numpy(dtype=np.float64)
+    inv_up = np.cumsum(np.where(is_up, shares_arr, 0.0))
+    inv_down = np.cumsum(np.where(is_up, 0.0, shares_arr))
+    total = inv_up + inv_down
+    held = total > 0
+
+    max_imbalance_ratio = 0.0
+    if held.any():
+        max_imbalance_ratio = float(np.max(np.maximum(inv_up, inv_down)[held] / total[held]))
+
+    # Look for patterns where trading stops despite conditions
+    # This is tricky - we'll use the max observed (= total bought per side) as proxy
+    max_exposure_up = float(shares_arr[is_up].sum())
+    max_exposure_down = float(shares_arr[~is_up].sum())
+
+    params = {
+        'max_trades_per_session': max_trades_per_session,
+        'max_imbalance_ratio': float(max_imbalance_ratio),
+        'max_exposure_up_shares': max_exposure_up,
+        'max_exposure_down_shares': max_exposure_down
+    }
+
+    return market, params
+
+
+def infer_risk_limits(trades: pd.DataFrame,
+                      watch_by_market: Dict[str, pd.DataFrame] = None) -> Dict[str, Any]:
     """
     Infer risk & exposure limits (hard safety caps).
+    Markets are processed in parallel.
     
     Analyzes:
     - max trades per market session
@@ -1099,81 +1332,79 @@ def infer_risk_limits(trades: pd.DataFrame) -> Dict[str, Any]:
     
     Args:
         trades: Trade rows dataframe (WATCH trades only)
+        watch_by_market: Optional precomputed per-market split (see
+            split_watch_trades_by_market); computed here if not supplied
         
     Returns:
         Dictionary with risk limit parameters per market
     """
-    watch_trades = trades[trades['bot'] == 'WATCH'].copy()
-    
-    if len(watch_trades) == 0:
+    if watch_by_market is None:
+        watch_by_market = split_watch_trades_by_market(trades)
+
+    if not watch_by_market:
         return {}
-    
-    risk_params = {}
-    
-    for market in watch_trades['market'].unique():
-        market_trades = watch_trades[watch_trades['market'] == market].copy()
-        market_trades = market_trades.sort_values('Timestamp').reset_index(drop=True)
-        
-        if len(market_trades) < 10:
-            continue
-        
-        # Infer max trades per session
-        # Group trades by time windows (sessions could be 15-min windows or 1-hour windows)
-        # For 15m markets, session = 15 minutes; for 1h markets, session = 1 hour
-        is_15m = '15' in market or '15m' in market
-        
-        # Determine session length
-        if is_15m:
-            session_ms = 15 * 60 * 1000  # 15 minutes
-        else:
-            session_ms = 60 * 60 * 1000  # 1 hour
-        
-        # Count trades per session
-        market_trades['session'] = (market_trades['Timestamp'] // session_ms) * session_ms
-        trades_per_session = market_trades.groupby('session').size()
-        max_trades_per_session = int(trades_per_session.max()) if len(trades_per_session) > 0 else None
-        
-        # Infer max inventory imbalance
-        inventory_up = 0.0
-        inventory_down = 0.0
-        max_imbalance_ratio = 0.0
-        
-        for idx, trade in market_trades.iterrows():
-            side = trade['side']
-            shares = trade['shares']
-            
-            if side == 'UP':
-                inventory_up += shares
-            else:
-                inventory_down += shares
-            
-            total = inventory_up + inventory_down
-            if total > 0:
-                imbalance = max(inventory_up, inventory_down) / total
-                max_imbalance_ratio = max(max_imbalance_ratio, imbalance)
-        
-        # Infer max exposure per side (absolute max shares)
-        max_up_shares = float(inventory_up)  # Final inventory (might be cap)
-        max_down_shares = float(inventory_down)
-        
-        # Look for patterns where trading stops despite conditions
-        # This is tricky - we'll use the max observed as proxy
-        max_exposure_up = float(market_trades[market_trades['side'] == 'UP']['shares'].sum()) if len(market_trades[market_trades['side'] == 'UP']) > 0 else 0.0
-        max_exposure_down = float(market_trades[market_trades['side'] == 'DOWN']['shares'].sum()) if len(market_trades[market_trades['side'] == 'DOWN']) > 0 else 0.0
-        
-        risk_params[market] = {
-            'max_trades_per_session': max_trades_per_session,
-            'max_imbalance_ratio': float(max_imbalance_ratio),
-            'max_exposure_up_shares': max_exposure_up,
-            'max_exposure_down_shares': max_exposure_down
-        }
-    
+
+    risk_params = _parallel_per_market(_infer_risk_one_market, watch_by_market.items())
+
     return {'per_market': risk_params}
 
 
-def infer_inventory_unwind(trades: pd.DataFrame, tape: pd.DataFrame) -> Dict[str, Any]:
+def _infer_unwind_one_market(market: str, market_trades: pd.DataFrame) -> Tuple[str, Any]:
+    """Infer unwind parameters for a single market (thread-pool worker).
+
+    Expects market_trades already sorted by Timestamp (see
+    split_watch_trades_by_market).
+    """
+    if len(market_trades) < 20:
+        return market, None
+
+    # Simulate inventory forward with cumulative sums; the running total
+    # inventory is all the unwind check needs
+    # Compare on the Series (int8 code compare for categorical side), then
+    # drop to a numpy bool array
+    is_up = (market_trades['side'] == 'UP').to_numpy()
+    shares_arr = market_trades['shares'].to_numpy(dtype=np.float64)
+    inv_up = np.cumsum(np.where(is_up, shares_arr, 0.0))
+    inv_down = np.cumsum(np.where(is_up, 0.0, shares_arr))
+    total_history = inv_up + inv_down
+
+    # Check for unwind patterns
+    # Pattern 1: Gradual reduction near end (last 20% of trades)
+    has_unwind = False
+    unwind_start_ratio = None
+
+    if len(total_history) > 5:
+        last_n = max(5, len(total_history) // 5)  # Last 20%
+        recent_totals = total_history[-last_n:]
+        earlier_totals = total_history[:-last_n]
+
+        if len(earlier_totals) > 0:
+            earlier_max_total = earlier_totals.max()
+            recent_min_total = recent_totals.min()
+
+            # If inventory reduces significantly near end
+            if earlier_max_total > 0 and recent_min_total < earlier_max_total * 0.8:
+                has_unwind = True
+                unwind_start_ratio = 0.8  # Start unwinding when inventory drops below 80% of max
+
+    # Pattern 2: Reduction without immediate rebalance
+    # (Would need to track if opposite side trades happen - simplified for now)
+    reduces_without_rebalance = False
+
+    params = {
+        'has_unwind': has_unwind,
+        'unwind_start_ratio': float(unwind_start_ratio) if unwind_start_ratio is not None else None,
+        'reduces_without_rebalance': reduces_without_rebalance
+    }
+
+    return market, params
+
+
+def infer_inventory_unwind(trades: pd.DataFrame, tape: pd.DataFrame,
+                           watch_by_market: Dict[str, pd.DataFrame] = None) -> Dict[str, Any]:
     """
     Infer inventory unwind/reduction behavior.
+    Markets are processed in parallel.
     
     Detects if WATCH ever:
     - reduces inventory without immediate rebalance
@@ -1182,141 +1413,166 @@ def infer_inventory_unwind(trades: pd.DataFrame, tape: pd.DataFrame) -> Dict[str
     Args:
         trades: Trade rows dataframe (WATCH trades only)
         tape: Full price tape dataframe
+        watch_by_market: Optional precomputed per-market split (see
+            split_watch_trades_by_market); computed here if not supplied
         
     Returns:
         Dictionary with unwind parameters per market
     """
-    watch_trades = trades[trades['bot'] == 'WATCH'].copy()
-    
-    if len(watch_trades) == 0:
+    if watch_by_market is None:
+        watch_by_market = split_watch_trades_by_market(trades)
+
+    if not watch_by_market:
         return {}
-    
-    unwind_params = {}
-    
-    for market in watch_trades['market'].unique():
-        market_trades = watch_trades[watch_trades['market'] == market].copy()
-        market_trades = market_trades.sort_values('Timestamp').reset_index(drop=True)
-        
-        if len(market_trades) < 20:
-            continue
-        
-        # Simulate inventory forward and backward
-        inventory_up = 0.0
-        inventory_down = 0.0
-        inventory_history = []
-        
-        for idx, trade in market_trades.iterrows():
-            side = trade['side']
-            shares = trade['shares']
-            
-            if side == 'UP':
-                inventory_up += shares
-            else:
-                inventory_down += shares
-            
-            total = inventory_up + inventory_down
-            if total > 0:
-                ratio_up = inventory_up / total
-            else:
-                ratio_up = 0.5
-            
-            inventory_history.append({
-                'timestamp': trade['Timestamp'],
-                'inventory_up': inventory_up,
-                'inventory_down': inventory_down,
-                'total': total,
-                'ratio_up': ratio_up
-            })
-        
-        # Check for unwind patterns
-        # Pattern 1: Gradual reduction near end (last 20% of trades)
-        has_unwind = False
-        unwind_start_ratio = None
-        
-        if len(inventory_history) > 5:
-            last_n = max(5, len(inventory_history) // 5)  # Last 20%
-            recent_history = inventory_history[-last_n:]
-            earlier_history = inventory_history[:-last_n] if len(inventory_history) > last_n else []
-            
-            if len(earlier_history) > 0:
-                earlier_max_total = max(h['total'] for h in earlier_history)
-                recent_min_total = min(h['total'] for h in recent_history)
-                
-                # If inventory reduces significantly near end
-                if earlier_max_total > 0 and recent_min_total < earlier_max_total * 0.8:
-                    has_unwind = True
-                    unwind_start_ratio = 0.8  # Start unwinding when inventory drops below 80% of max
-        
-        # Pattern 2: Reduction without immediate rebalance
-        # (Would need to track if opposite side trades happen - simplified for now)
-        reduces_without_rebalance = False
-        
-        unwind_params[market] = {
-            'has_unwind': has_unwind,
-            'unwind_start_ratio': float(unwind_start_ratio) if unwind_start_ratio is not None else None,
-            'reduces_without_rebalance': reduces_without_rebalance
-        }
-    
+
+    unwind_params = _parallel_per_market(_infer_unwind_one_market, watch_by_market.items())
+
     return {'per_market': unwind_params}
 
 
-def infer_market_reset(trades: pd.DataFrame, tape: pd.DataFrame) -> Dict[str, Any]:
+def _infer_reset_one_market(market: str, market_trades: pd.DataFrame) -> Tuple[str, Any]:
+    """Infer market-reset parameters for a single market (thread-pool worker).
+
+    Expects market_trades already sorted by Timestamp (see
+    split_watch_trades_by_market).
+    """
+    if len(market_trades) < 5:
+        return market, None
+
+    # Analyze gap patterns between markets
+    # For now, we'll assume inventory resets between market switches
+    # (This is conservative and common in trading systems)
+
+    # Check for long inactivity gaps (potential market switches)
+    timestamps = market_trades['Timestamp'].values
+    if len(timestamps) > 1:
+        gaps = np.diff(timestamps) / (1000 * 60 * 60)  # hours
+        max_gap_hours = float(gaps.max()) if len(gaps) > 0 else 0.0
+
+        # If gap > 2 hours, likely market switch (inventory resets)
+        # For 15m markets, gaps > 30 min might indicate switch
+        is_15m = _is_15m_market(market)
+        inactivity_threshold_hours = 0.5 if is_15m else 2.0
+
+        resets_on_gap = max_gap_hours > inactivity_threshold_hours
+    else:
+        resets_on_gap = True  # Single trade = new market
+
+    params = {
+        'resets_on_market_switch': True,  # Conservative default
+        'resets_on_inactivity': resets_on_gap,
+        'inactivity_threshold_hours': float(inactivity_threshold_hours) if len(timestamps) > 1 else 1.0
+    }
+
+    return market, params
+
+
+def infer_market_reset(trades: pd.DataFrame, tape: pd.DataFrame,
+                       watch_by_market: Dict[str, pd.DataFrame] = None) -> Dict[str, Any]:
     """
     Infer market reset behavior (what happens when market switches or inactivity).
+    Markets are processed in parallel.
     
     Args:
         trades: Trade rows dataframe (WATCH trades only)
         tape: Full price tape dataframe
+        watch_by_market: Optional precomputed per-market split (see
+            split_watch_trades_by_market); computed here if not supplied
         
     Returns:
         Dictionary with reset parameters per market
     """
-    watch_trades = trades[trades['bot'] == 'WATCH'].copy()
-    
-    if len(watch_trades) == 0:
+    if watch_by_market is None:
+        watch_by_market = split_watch_trades_by_market(trades)
+
+    if not watch_by_market:
         return {}
-    
-    reset_params = {}
-    
-    for market in watch_trades['market'].unique():
-        market_trades = watch_trades[watch_trades['market'] == market].copy()
-        market_trades = market_trades.sort_values('Timestamp').reset_index(drop=True)
-        
-        if len(market_trades) < 5:
-            continue
-        
-        # Analyze gap patterns between markets
-        # For now, we'll assume inventory resets between market switches
-        # (This is conservative and common in trading systems)
-        
-        # Check for long inactivity gaps (potential market switches)
-        timestamps = market_trades['Timestamp'].values
-        if len(timestamps) > 1:
-            gaps = np.diff(timestamps) / (1000 * 60 * 60)  # hours
-            max_gap_hours = float(gaps.max()) if len(gaps) > 0 else 0.0
-            
-            # If gap > 2 hours, likely market switch (inventory resets)
-            # For 15m markets, gaps > 30 min might indicate switch
-            is_15m = '15' in market or '15m' in market
-            inactivity_threshold_hours = 0.5 if is_15m else 2.0
-            
-            resets_on_gap = max_gap_hours > inactivity_threshold_hours
-        else:
-            resets_on_gap = True  # Single trade = new market
-        
-        reset_params[market] = {
-            'resets_on_market_switch': True,  # Conservative default
-            'resets_on_inactivity': resets_on_gap,
-            'inactivity_threshold_hours': float(inactivity_threshold_hours) if len(timestamps) > 1 else 1.0
-        }
-    
+
+    reset_params = _parallel_per_market(_infer_reset_one_market, watch_by_market.items())
+
     return {'per_market': reset_params}
 
 
-def infer_data_quality_filters(tape: pd.DataFrame, trades: pd.DataFrame) -> Dict[str, Any]:
+def _infer_quality_one_market(market: str,
+                              group: Tuple[pd.DataFrame, pd.DataFrame]) -> Tuple[str, Any]:
+    """Infer data-quality filter parameters for a single market (thread-pool worker).
+
+    group is a (market_trades, market_tape) pair.
+    """
+    market_trades, market_tape = group
+
+    if market_tape is None or len(market_tape) == 0:
+        return market, None
+
+    # Filter 1: UP + DOWN should be ~1.0 (local array; nothing needs a
+    # price_sum column on the frame beyond this deviation calc)
+    price_sum = market_tape['Price UP ($)'].to_numpy() + market_tape['Price DOWN ($)'].to_numpy()
+    price_sum_deviations = np.abs(price_sum - 1.0)
+    max_deviation = float(price_sum_deviations.max()) if len(price_sum_deviations) > 0 else 0.0
+
+    # Check if trades happen when deviation is high
+    # Nearest-tick lookup via binary search on the sorted tape instead
+    # of an O(N_tape) abs().idxmin() scan per trade
+    if len(market_trades) > 0:
+        tape_ts = market_tape['Timestamp'].to_numpy()
+        order = np.argsort(tape_ts, kind='stable')
+        tape_ts = tape_ts[order]
+        price_sum_arr = price_sum[order]
+        trade_ts_arr = market_trades['Timestamp'].to_numpy()
+
+        insert_idx = np.searchsorted(tape_ts, trade_ts_arr)
+        idx_left = np.clip(insert_idx - 1, 0, len(tape_ts) - 1)
+        idx_right = np.clip(insert_idx, 0, len(tape_ts) - 1)
+        # Prefer the left neighbor on ties, matching idxmin's
+        # first-occurrence behavior
+        closest = np.where(np.abs(tape_ts[idx_left] - trade_ts_arr) <=
+                           np.abs(tape_ts[idx_right] - trade_ts_arr),
+                           idx_left, idx_right)
+        trades_with_deviation = np.abs(price_sum_arr[closest] - 1.0)
+    else:
+        trades_with_deviation = np.array([])
+
+    if len(trades_with_deviation) > 0:
+        median_deviation_at_trade = float(np.median(trades_with_deviation))
+        # If trades avoid high deviations, infer threshold
+        max_allowed_deviation = max(0.05, median_deviation_at_trade * 2)  # Allow 2x median, min 5%
+    else:
+        max_allowed_deviation = 0.05  # Default
+
+    # Filter 2: Timestamp jumps
+    if len(market_tape) > 1:
+        time_diffs = np.diff(market_tape['Timestamp'].to_numpy()) * 0.001  # seconds
+        max_time_jump = float(time_diffs.max()) if len(time_diffs) > 0 else 0.0
+        # If jump > 60 seconds, might be filtered
+        timestamp_jump_threshold_seconds = 60.0
+    else:
+        timestamp_jump_threshold_seconds = 60.0
+
+    # Filter 3: Price gaps
+    if len(market_tape) > 1:
+        price_up_diffs = market_tape['Price UP ($)'].diff().abs().dropna()
+        price_down_diffs = market_tape['Price DOWN ($)'].diff().abs().dropna()
+        max_price_gap = float(max(price_up_diffs.max(), price_down_diffs.max())) if len(price_up_diffs) > 0 and len(price_down_diffs) > 0 else 0.0
+        # If gap > 0.2, might be filtered
+        price_gap_threshold = max(0.2, max_price_gap * 0.5)  # Conservative
+    else:
+        price_gap_threshold = 0.2
+
+    params = {
+        'max_price_sum_deviation': float(max_allowed_deviation),
+        'timestamp_jump_threshold_seconds': float(timestamp_jump_threshold_seconds),
+        'price_gap_threshold': float(price_gap_threshold)
+    }
+
+    return market, params
+
+
+def infer_data_quality_filters(tape: pd.DataFrame, trades: pd.DataFrame,
+                               watch_by_market: Dict[str, pd.DataFrame] = None) -> Dict[str, Any]:
     """
     Infer data quality filters.
-    
+    Markets are processed in parallel.
+
     Checks if WATCH avoids trading when:
     - UP + DOWN ≠ ~1.0
     - timestamps jump
@@ -1325,71 +1581,26 @@ def infer_data_quality_filters(tape: pd.DataFrame, trades: pd.DataFrame) -> Dict
     Args:
         tape: Full price tape dataframe
         trades: Trade rows dataframe
+        watch_by_market: Optional precomputed per-market split (see
+            split_watch_trades_by_market); computed here if not supplied
         
     Returns:
         Dictionary with data quality filter parameters per market
     """
-    watch_trades = trades[trades['bot'] == 'WATCH'].copy()
-    
-    if len(watch_trades) == 0:
+    if watch_by_market is None:
+        watch_by_market = split_watch_trades_by_market(trades)
+
+    if not watch_by_market:
         return {}
-    
-    filter_params = {}
-    
-    for market in watch_trades['market'].unique():
-        market_tape = tape[tape['market'] == market].copy()
-        market_trades = watch_trades[watch_trades['market'] == market].copy()
-        
-        if len(market_tape) == 0:
-            continue
-        
-        # Filter 1: UP + DOWN should be ~1.0
-        market_tape['price_sum'] = market_tape['Price UP ($)'] + market_tape['Price DOWN ($)']
-        price_sum_deviations = (market_tape['price_sum'] - 1.0).abs()
-        max_deviation = float(price_sum_deviations.max()) if len(price_sum_deviations) > 0 else 0.0
-        
-        # Check if trades happen when deviation is high
-        trades_with_deviation = []
-        for idx, trade in market_trades.iterrows():
-            trade_ts = trade['Timestamp']
-            # Find closest tape entry
-            closest_idx = (market_tape['Timestamp'] - trade_ts).abs().idxmin()
-            closest_row = market_tape.loc[closest_idx]
-            deviation = abs(closest_row['price_sum'] - 1.0)
-            trades_with_deviation.append(deviation)
-        
-        if len(trades_with_deviation) > 0:
-            median_deviation_at_trade = float(np.median(trades_with_deviation))
-            # If trades avoid high deviations, infer threshold
-            max_allowed_deviation = max(0.05, median_deviation_at_trade * 2)  # Allow 2x median, min 5%
-        else:
-            max_allowed_deviation = 0.05  # Default
-        
-        # Filter 2: Timestamp jumps
-        if len(market_tape) > 1:
-            time_diffs = market_tape['Timestamp'].diff().dropna() / 1000.0  # seconds
-            max_time_jump = float(time_diffs.max()) if len(time_diffs) > 0 else 0.0
-            # If jump > 60 seconds, might be filtered
-            timestamp_jump_threshold_seconds = 60.0
-        else:
-            timestamp_jump_threshold_seconds = 60.0
-        
-        # Filter 3: Price gaps
-        if len(market_tape) > 1:
-            price_up_diffs = market_tape['Price UP ($)'].diff().abs().dropna()
-            price_down_diffs = market_tape['Price DOWN ($)'].diff().abs().dropna()
-            max_price_gap = float(max(price_up_diffs.max(), price_down_diffs.max())) if len(price_up_diffs) > 0 and len(price_down_diffs) > 0 else 0.0
-            # If gap > 0.2, might be filtered
-            price_gap_threshold = max(0.2, max_price_gap * 0.5)  # Conservative
-        else:
-            price_gap_threshold = 0.2
-        
-        filter_params[market] = {
-            'max_price_sum_deviation': float(max_allowed_deviation),
-            'timestamp_jump_threshold_seconds': float(timestamp_jump_threshold_seconds),
-            'price_gap_threshold': float(price_gap_threshold)
-        }
-    
+
+    # Group the tape once and pair each market's trades with its tape
+    tape_by_market = dict(tuple(tape.groupby('market', sort=False)))
+
+    pairs = {market: (market_trades, tape_by_market.get(market))
+             for market, market_trades in watch_by_market.items()}
+
+    filter_params = _parallel_per_market(_infer_quality_one_market, pairs.items())
+
     return {'per_market': filter_params}
 
 
@@ -1409,37 +1620,38 @@ def infer_all_parameters(tape: pd.DataFrame, trades: pd.DataFrame) -> Dict[str,
     """
     print("\n=== Inferring Parameters ===")
     
+    # Warm the numba kernels (loads the on-disk cache or compiles once) so
+    # JIT latency doesn't land inside the per-market dispatch
+    _score_side_selection(np.zeros(1, dtype=np.bool_), np.zeros(1), np.zeros(1), np.zeros(1))
+    _fill_bias_stats(np.zeros(1), np.zeros(1))
+
+    # Split WATCH trades per market once (single sort, zero-copy views)
+    # and reuse across all inference functions
+    watch_by_market = split_watch_trades_by_market(trades)
+
     # Infer existing parameters per market
     params = {
-        'entry_params': infer_entry_rules(trades, tape),
-        'size_params': infer_sizing_function(trades),
-        'inventory_params': infer_inventory_behavior(trades),
-        'cadence_params': infer_cadence(trades),
+        'entry_params': infer_entry_rules(trades, tape, watch_by_market),
+        'size_params': infer_sizing_function(trades, watch_by_market),
+        'inventory_params': infer_inventory_behavior(trades, watch_by_market),
+        'cadence_params': infer_cadence(trades, watch_by_market),
         # New parameter classes
-        'side_selection_params': infer_side_selection(trades, tape),
-        'execution_params': infer_execution_model(trades, tape),
-        'cooldown_params': infer_cooldown_rules(trades, tape),
-        'risk_params': infer_risk_limits(trades),
-        'unwind_params': infer_inventory_unwind(trades, tape),
-        'reset_params': infer_market_reset(trades, tape),
-        'quality_filter_params': infer_data_quality_filters(tape, trades)
+        'side_selection_params': infer_side_selection(trades, tape, watch_by_market),
+        'execution_params': infer_execution_model(trades, tape, watch_by_market),
+        'cooldown_params': infer_cooldown_rules(trades, tape, watch_by_market),
+        'risk_params': infer_risk_limits(trades, watch_by_market),
+        'unwind_params': infer_inventory_unwind(trades, tape, watch_by_market),
+        'reset_params': infer_market_reset(trades, tape, watch_by_market),
+        'quality_filter_params': infer_data_quality_filters(tape, trades, watch_by_market)
     }
-    
-    # Apply fallback logic (n < 50) - but first compute confidence to know which markets need fallback
-    # Compute initial confidence scores
-    initial_confidence = {}
-    watch_trades = trades[trades['bot'] == 'WATCH'].copy()
-    for market in watch_trades['market'].unique():
-        market_trades = watch_trades[watch_trades['market'] == market].copy()
-        initial_confidence[market] = len(market_trades)
-    
+
     # Apply fallback logic (n < 50)
     print("\n=== Applying Fallback Logic (n < 50) ===")
-    params = apply_fallback_logic(params, trades)
-    
+    params = apply_fallback_logic(params, trades, watch_by_market)
+
     # Compute confidence scores
     print("\n=== Computing Confidence Scores ===")
-    confidence = compute_confidence_scores(trades, tape, params)
+    confidence = compute_confidence_scores(trades, tape, params, watch_by_market)
     params['confidence'] = {'per_market': confidence}
     
     # Print per-market summary
@@ -1454,7 +1666,7 @@ def infer_all_parameters(tape: pd.DataFrame, trades: pd.DataFrame) -> Dict[str,
     
     # Print summary of new parameters
     print("\n=== New Parameter Classes Summary ===")
-    for market in sorted(watch_trades['market'].unique()):
+    for market in sorted(watch_by_market.keys()):
         market_params = {}
         for param_type in ['side_selection_params', 'execution_params', 'cooldown_params',
                           'risk_params', 'unwind_params', 'reset_params', 'quality_filter_params']:
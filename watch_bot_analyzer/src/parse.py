@@ -61,6 +61,12 @@ def parse_notes(df: pd.DataFrame) -> pd.DataFrame:
     # Convert numeric columns
     df['shares'] = pd.to_numeric(df['shares'], errors='coerce')
     df['fill_px'] = pd.to_numeric(df['fill_px'], errors='coerce')
+
+    # side/bot only ever hold a couple of labels (NaN on non-trade rows);
+    # categorical storage makes the many downstream == compares int8 code
+    # compares
+    df['side'] = df['side'].astype('category')
+    df['bot'] = df['bot'].astype('category')
     
     parsed_count = df['notes_parsed'].sum()
     total_notes = df['Notes'].notna().sum()
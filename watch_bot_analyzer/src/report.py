@@ -58,53 +58,68 @@ def generate_diff_report(tape: pd.DataFrame, trades: pd.DataFrame, output_dir: s
     output_path = Path(output_dir)
     output_path.mkdir(exist_ok=True)
     
-    watch_trades = trades[trades['bot'] == 'WATCH'].copy()
-    paper_trades = trades[trades['bot'] == 'PAPER'].copy()
-    
-    diff_records = []
-    
+    watch_trades = trades[trades['bot'] == 'WATCH']
+    paper_trades = trades[trades['bot'] == 'PAPER']
+
+    diff_frames = []
+
     for market in watch_trades['market'].unique():
-        market_watch = watch_trades[watch_trades['market'] == market].copy()
-        market_paper = paper_trades[paper_trades['market'] == market].copy()
-        
+        market_watch = watch_trades[watch_trades['market'] == market]
+        market_paper = paper_trades[paper_trades['market'] == market]
+
         if len(market_paper) == 0:
             continue
-        
-        market_paper = market_paper.sort_values('Timestamp').reset_index(drop=True)
-        
-        for _, watch_trade in market_watch.iterrows():
-            watch_ts = watch_trade['Timestamp']
-            
-            # Find nearest PAPER trade within ±2s
-            time_diffs = abs(market_paper['Timestamp'] - watch_ts) / 1000.0
-            within_window = time_diffs <= 2.0
-            
-            if within_window.any():
-                nearest_idx = time_diffs[within_window].idxmin()
-                paper_trade = market_paper.loc[nearest_idx]
-                
-                dt_ms = time_diffs[nearest_idx] * 1000
-                same_side = watch_trade['side'] == paper_trade['side']
-                size_ratio = paper_trade['shares'] / watch_trade['shares'] if watch_trade['shares'] > 0 else 0
-                fill_px_diff = abs(watch_trade.get('fill_px', 0) - paper_trade.get('fill_px', 0))
-                
-                diff_records.append({
-                    'market': market,
-                    'watch_timestamp': watch_ts,
-                    'paper_timestamp': paper_trade['Timestamp'],
-                    'dt_ms': dt_ms,
-                    'watch_side': watch_trade['side'],
-                    'paper_side': paper_trade['side'],
-                    'same_side': same_side,
-                    'watch_shares': watch_trade['shares'],
-                    'paper_shares': paper_trade['shares'],
-                    'size_ratio': size_ratio,
-                    'watch_fill_px': watch_trade.get('fill_px', 0),
-                    'paper_fill_px': paper_trade.get('fill_px', 0),
-                    'fill_px_diff': fill_px_diff
-                })
-    
-    diff_df = pd.DataFrame(diff_records)
+
+        # Nearest PAPER trade within ±2s for every WATCH trade in one
+        # O(N+M) merge pass (ties resolve to the earlier PAPER trade,
+        # like the old idxmin scan)
+        market_watch = market_watch.sort_values('Timestamp')
+        market_paper = market_paper.sort_values('Timestamp')
+
+        cols = ['Timestamp', 'side', 'shares']
+        if 'fill_px' in trades.columns:
+            cols.append('fill_px')
+        paper_for_merge = market_paper[cols].copy()
+        paper_for_merge['ts_paper'] = paper_for_merge['Timestamp']
+        merged = pd.merge_asof(
+            market_watch[cols], paper_for_merge,
+            on='Timestamp', tolerance=2000, direction='nearest',
+            suffixes=('_watch', '_paper'))
+
+        matched = merged[merged['ts_paper'].notna()]
+        if len(matched) == 0:
+            continue
+
+        watch_shares = matched['shares_watch'].to_numpy(dtype=np.float64)
+        paper_shares = matched['shares_paper'].to_numpy(dtype=np.float64)
+        if 'fill_px' in trades.columns:
+            watch_fill = matched['fill_px_watch'].to_numpy(dtype=np.float64)
+            paper_fill = matched['fill_px_paper'].to_numpy(dtype=np.float64)
+        else:
+            watch_fill = np.zeros(len(matched))
+            paper_fill = np.zeros(len(matched))
+
+        diff_frames.append(pd.DataFrame({
+            'market': market,
+            'watch_timestamp': matched['Timestamp'].to_numpy(),
+            # ts_paper comes out of merge_asof float64 (NaN on misses); the
+            # misses are gone here, so restore the int timestamps the CSV
+            # always carried
+            'paper_timestamp': matched['ts_paper'].astype('int64').to_numpy(),
+            'dt_ms': (matched['Timestamp'] - matched['ts_paper']).abs().astype(float).to_numpy(),
+            'watch_side': matched['side_watch'].to_numpy(),
+            'paper_side': matched['side_paper'].to_numpy(),
+            'same_side': (matched['side_watch'] == matched['side_paper']).to_numpy(),
+            'watch_shares': watch_shares,
+            'paper_shares': paper_shares,
+            'size_ratio': np.divide(paper_shares, watch_shares,
+                                    out=np.zeros(len(matched)), where=watch_shares > 0),
+            'watch_fill_px': watch_fill,
+            'paper_fill_px': paper_fill,
+            'fill_px_diff': np.abs(watch_fill - paper_fill)
+        }))
+
+    diff_df = pd.concat(diff_frames, ignore_index=True) if diff_frames else pd.DataFrame()
     
     if len(diff_df) > 0:
         # Add aggregate summary per market
@@ -4,23 +4,77 @@ Model validation - compare inferred policy against actual WATCH trades.
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Tuple, Any
+from joblib import Parallel, delayed
+from numba import njit
 import json
 
 
+# Default price-bucket edges, matching infer.PRICE_BIN_EDGES; built once
+# at import instead of per get_size call.
+DEFAULT_BIN_EDGES = np.arange(0, 1.05, 0.05)
+
+# Interval label strings per bin-edge set, so get_size doesn't construct a
+# pd.Interval and stringify it on every lookup. All markets normally share
+# the default edges, so this holds a single entry.
+_PRICE_BUCKET_LABELS_CACHE: Dict[tuple, List[str]] = {}
+
+
+def _price_bucket_labels(bin_edges) -> List[str]:
+    """Return (cached) str(pd.Interval) labels for consecutive bin edges."""
+    key = tuple(float(edge) for edge in bin_edges)
+    labels = _PRICE_BUCKET_LABELS_CACHE.get(key)
+    if labels is None:
+        labels = [str(pd.Interval(bin_edges[i], bin_edges[i + 1]))
+                  for i in range(len(bin_edges) - 1)]
+        _PRICE_BUCKET_LABELS_CACHE[key] = labels
+    return labels
+
+
 class PolicySimulator:
     """Simple policy simulator based on inferred parameters."""
     
     def __init__(self, params: Dict[str, Any]):
         self.params = params
-        self.entry_params = params.get('entry_params', {}).get('per_market', {})
-        self.size_params = params.get('size_params', {}).get('per_market', {})
-        self.inventory_params = params.get('inventory_params', {}).get('per_market', {})
-        self.cadence_params = params.get('cadence_params', {}).get('per_market', {})
+
+        # Accept both layouts: market-first ({market: {'entry_params': ...}})
+        # as emitted by infer_all_parameters, and the legacy param-type-first
+        # ({'entry_params': {'per_market': {...}}}) form
+        first = next(iter(params.values()), None)
+        if isinstance(first, dict) and 'entry_params' in first:
+            self.entry_params = {m: mp.get('entry_params', {}) for m, mp in params.items()}
+            self.size_params = {m: mp.get('size_params', {}) for m, mp in params.items()}
+            self.inventory_params = {m: mp.get('inventory_params', {}) for m, mp in params.items()}
+            self.cadence_params = {m: mp.get('cadence_params', {}) for m, mp in params.items()}
+        else:
+            self.entry_params = params.get('entry_params', {}).get('per_market', {})
+            self.size_params = params.get('size_params', {}).get('per_market', {})
+            self.inventory_params = params.get('inventory_params', {}).get('per_market', {})
+            self.cadence_params = params.get('cadence_params', {}).get('per_market', {})
         
         # State
         self.inventory_up = {}
         self.inventory_down = {}
         self.last_trade_time = {}
+
+        # Dense per-market size tables, built lazily (see _build_size_lut)
+        self._size_luts = {}
+
+        # Inventory limits with the inf defaults substituted once, so the
+        # per-call check is three scalar compares
+        self._inv_limits = {
+            market: (float(p.get('max_total_shares', np.inf)),
+                     float(p.get('max_up_shares', np.inf)),
+                     float(p.get('max_down_shares', np.inf)))
+            for market, p in self.inventory_params.items()
+        }
+
+    def _market_size_lut(self, market: str):
+        """Cached dense size table for a market (see _build_size_lut)."""
+        cached = self._size_luts.get(market)
+        if cached is None:
+            cached = _build_size_lut(self.size_params[market])
+            self._size_luts[market] = cached
+        return cached
     
     def should_trade(self, market: str, timestamp: float, up_px: float, down_px: float, 
                     delta_5s: float = None) -> Tuple[bool, str]:
@@ -32,9 +86,21 @@ class PolicySimulator:
         """
         if market not in self.entry_params:
             return False, None
-        
+
         entry = self.entry_params[market]
-        
+
+        # Cheapest, highest-rejection gate first: two float compares filter
+        # the vast majority of ticks before any cadence/momentum/inventory
+        # work
+        up_in_band = (entry.get('up_price_min') is not None
+                      and entry.get('up_price_max') is not None
+                      and entry['up_price_min'] <= up_px <= entry['up_price_max'])
+        down_in_band = (entry.get('down_price_min') is not None
+                        and entry.get('down_price_max') is not None
+                        and entry['down_price_min'] <= down_px <= entry['down_price_max'])
+        if not (up_in_band or down_in_band):
+            return False, None
+
         # Check cadence (minimum inter-trade time)
         if market in self.cadence_params:
             cadence = self.cadence_params[market]
@@ -42,148 +108,122 @@ class PolicySimulator:
                 time_since_last = (timestamp - self.last_trade_time[market]) / 1000.0
                 if time_since_last < cadence.get('min_inter_trade_ms', 0) / 1000.0:
                     return False, None
-        
-        # Check entry rules
+
         # UP trades
-        if entry.get('up_price_min') is not None and entry.get('up_price_max') is not None:
-            if entry['up_price_min'] <= up_px <= entry['up_price_max']:
-                # Check momentum/reversion if available
-                if entry['mode'] != 'none' and delta_5s is not None:
-                    if entry['mode'] == 'momentum' and delta_5s < entry['momentum_threshold']:
-                        return False, None
-                    if entry['mode'] == 'reversion' and delta_5s > -entry['momentum_threshold']:
-                        return False, None
-                
-                # Check inventory limits
-                if self._check_inventory(market, 'UP'):
-                    return True, 'UP'
-        
+        if up_in_band:
+            # Check momentum/reversion if available
+            if entry['mode'] != 'none' and delta_5s is not None:
+                if entry['mode'] == 'momentum' and delta_5s < entry['momentum_threshold']:
+                    return False, None
+                if entry['mode'] == 'reversion' and delta_5s > -entry['momentum_threshold']:
+                    return False, None
+
+            # Check inventory limits
+            if self._check_inventory(market, 'UP'):
+                return True, 'UP'
+
         # DOWN trades
-        if entry.get('down_price_min') is not None and entry.get('down_price_max') is not None:
-            if entry['down_price_min'] <= down_px <= entry['down_price_max']:
-                # Check momentum/reversion if available
-                if entry['mode'] != 'none' and delta_5s is not None:
-                    # For DOWN, we'd check DOWN price delta
-                    if entry['mode'] == 'momentum' and delta_5s < entry['momentum_threshold']:
-                        return False, None
-                    if entry['mode'] == 'reversion' and delta_5s > -entry['momentum_threshold']:
-                        return False, None
-                
-                # Check inventory limits
-                if self._check_inventory(market, 'DOWN'):
-                    return True, 'DOWN'
-        
+        if down_in_band:
+            # Check momentum/reversion if available
+            if entry['mode'] != 'none' and delta_5s is not None:
+                # For DOWN, we'd check DOWN price delta
+                if entry['mode'] == 'momentum' and delta_5s < entry['momentum_threshold']:
+                    return False, None
+                if entry['mode'] == 'reversion' and delta_5s > -entry['momentum_threshold']:
+                    return False, None
+
+            # Check inventory limits
+            if self._check_inventory(market, 'DOWN'):
+                return True, 'DOWN'
+
         return False, None
     
     def _check_inventory(self, market: str, side: str) -> bool:
         """Check if inventory limits allow trading."""
-        if market not in self.inventory_params:
+        limits = self._inv_limits.get(market)
+        if limits is None:
             return True
-        
-        inv_params = self.inventory_params[market]
-        
+
+        max_total, max_up, max_down = limits
+
         if market not in self.inventory_up:
             self.inventory_up[market] = 0.0
             self.inventory_down[market] = 0.0
-        
+
         current_up = self.inventory_up[market]
         current_down = self.inventory_down[market]
-        total = current_up + current_down
-        
+
         # Check max total
-        if total >= inv_params.get('max_total_shares', float('inf')):
+        if current_up + current_down >= max_total:
             return False
-        
+
         # Check side-specific limits
-        if side == 'UP' and current_up >= inv_params.get('max_up_shares', float('inf')):
+        if side == 'UP' and current_up >= max_up:
             return False
-        if side == 'DOWN' and current_down >= inv_params.get('max_down_shares', float('inf')):
+        if side == 'DOWN' and current_down >= max_down:
             return False
-        
+
         return True
     
-    def get_size(self, market: str, side: str, side_px: float) -> float:
-        """Get trade size based on price bucket x inventory bucket [x volatility bucket] (2D/3D table)."""
+    def _apply_vol_multiplier(self, size_params: Dict[str, Any], size: float,
+                              volatility: float) -> float:
+        """Scale a 2D size by the per-volatility multiplier (compact model
+        emitted when the 3D table was too sparse)."""
+        vol_multipliers = size_params.get('vol_multipliers')
+        if not vol_multipliers or volatility is None:
+            return size
+
+        vol_thresholds = size_params.get('volatility_bucket_thresholds') or []
+        if len(vol_thresholds) < 2:
+            return size
+
+        vol_bucket_idx = len(vol_thresholds) - 2
+        for i in range(len(vol_thresholds) - 1):
+            if volatility <= vol_thresholds[i + 1]:
+                vol_bucket_idx = i
+                break
+
+        return size * vol_multipliers.get(f'vol_{vol_bucket_idx}', 1.0)
+
+    def get_size(self, market: str, side: str, side_px: float,
+                 volatility: float = None) -> float:
+        """Get trade size based on price bucket x inventory bucket [x volatility bucket] (2D/3D table).
+
+        Looks up the dense per-market table (fallback chain resolved once
+        at build time) by integer bucket indices; no string keys or dict
+        hashing on the per-call path.
+        """
         if market not in self.size_params:
             return 1.0  # default
-        
+
         size_params = self.size_params[market]
-        size_table = size_params.get('size_table', {})
-        
+        bin_edges, inv_thresholds, size_lut, exact_hit = self._market_size_lut(market)
+
         # Find price bucket
-        bin_edges = size_params.get('bin_edges', np.arange(0, 1.05, 0.05))
-        bucket_idx = np.digitize(side_px, bin_edges) - 1
-        bucket_idx = max(0, min(bucket_idx, len(bin_edges) - 2))
-        price_bucket = pd.Interval(bin_edges[bucket_idx], bin_edges[bucket_idx + 1])
-        price_bucket_str = str(price_bucket)
-        
+        bucket_idx = int(np.digitize(side_px, bin_edges)) - 1
+        bucket_idx = max(0, min(bucket_idx, size_lut.shape[0] - 1))
+
         # Get inventory bucket using quantile thresholds
         eps = 1e-6
         if market not in self.inventory_up:
             self.inventory_up[market] = 0.0
             self.inventory_down[market] = 0.0
-        
-        inv_up = self.inventory_up[market]
-        inv_down = self.inventory_down[market]
-        inventory_ratio = inv_up / max(inv_down, eps)
-        
-        # Determine inventory bucket using thresholds
-        inv_thresholds = size_params.get('inventory_bucket_thresholds', None)
-        if inv_thresholds and len(inv_thresholds) >= 2:
-            inv_bucket_idx = 0
-            for i in range(len(inv_thresholds) - 1):
-                if inventory_ratio <= inv_thresholds[i + 1]:
-                    inv_bucket_idx = i
-                    break
-            else:
-                inv_bucket_idx = len(inv_thresholds) - 2
-            inv_bucket = f'bucket_{inv_bucket_idx}'
-        else:
-            # Fallback to old logic if thresholds not available
-            if inventory_ratio <= 0.8:
-                inv_bucket = 'low'
-            elif inventory_ratio <= 1.25:
-                inv_bucket = 'med_low'
-            elif inventory_ratio <= 2.0:
-                inv_bucket = 'med_high'
-            else:
-                inv_bucket = 'high'
-        
-        # Check if 3D table (with volatility)
-        has_volatility = size_params.get('has_volatility_conditioning', False)
-        if has_volatility:
-            # For 3D, we'd need volatility - skip for now, use 2D fallback
-            size_table_2d = size_params.get('size_table_2d', {})
-            key_2d = f"{price_bucket_str}|{inv_bucket}"
-            if key_2d in size_table_2d:
-                return size_table_2d[key_2d]
-        else:
-            # 2D lookup: price_bucket|inventory_bucket
-            key_2d = f"{price_bucket_str}|{inv_bucket}"
-            if key_2d in size_table:
-                return size_table[key_2d]
-        
-        # Fallback 1: Try other inventory buckets for same price bucket
-        inventory_buckets = size_params.get('inventory_buckets', [])
-        if not inventory_buckets:
-            inventory_buckets = ['bucket_0', 'bucket_1', 'bucket_2', 'bucket_3']  # Fallback
-        
-        for fallback_bucket in inventory_buckets:
-            fallback_key = f"{price_bucket_str}|{fallback_bucket}"
-            fallback_table = size_params.get('size_table_2d', size_table)
-            if fallback_key in fallback_table:
-                return fallback_table[fallback_key]
-        
-        # Fallback 2: Use 1D table if available
-        size_table_1d = size_params.get('size_table_1d', {})
-        if price_bucket_str in size_table_1d:
-            return size_table_1d[price_bucket_str]
-        
-        # Fallback 3: Use median of all sizes
-        if size_table:
-            return np.median(list(size_table.values()))
-        
-        return 1.0
+
+        inventory_ratio = self.inventory_up[market] / max(self.inventory_down[market], eps)
+
+        # side='left' keeps a ratio equal to a threshold in the lower bucket
+        inv_bucket_idx = int(np.searchsorted(inv_thresholds, inventory_ratio, side='left')) - 1
+        inv_bucket_idx = max(0, min(inv_bucket_idx, size_lut.shape[1] - 1))
+
+        size = float(size_lut[bucket_idx, inv_bucket_idx])
+
+        # The volatility multiplier only ever applied to exact hits of the
+        # non-volatility 2D table, never to fallback-resolved cells
+        if (volatility is not None and exact_hit[bucket_idx, inv_bucket_idx]
+                and not size_params.get('has_volatility_conditioning', False)):
+            size = self._apply_vol_multiplier(size_params, size, volatility)
+
+        return size
     
     def execute_trade(self, market: str, timestamp: float, side: str, shares: float):
         """Update inventory after trade."""
@@ -199,6 +239,155 @@ class PolicySimulator:
         self.last_trade_time[market] = timestamp
 
 
+def _build_size_lut(size_params: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Materialize get_size's lookup + fallback chain as a dense 2D table.
+
+    Resolves every (price bucket, inventory bucket) cell once through the
+    same chain get_size walks per call (exact 2D key, other inventory
+    buckets, 1D table, median, 1.0), so the simulation kernel can use pure
+    integer indexing with no string keys or branching.
+
+    Returns:
+        (bin_edges, inventory_thresholds, lut, exact_hit) arrays; lut and
+        exact_hit have shape (n_price_buckets, n_inventory_buckets), with
+        exact_hit True where the cell came from the primary table rather
+        than the fallback chain
+    """
+    bin_edges = np.asarray(size_params.get('bin_edges', DEFAULT_BIN_EDGES), dtype=np.float64)
+    labels = _price_bucket_labels(bin_edges)
+
+    inv_thresholds = size_params.get('inventory_bucket_thresholds', None)
+    if inv_thresholds and len(inv_thresholds) >= 2:
+        thresholds = np.asarray(inv_thresholds, dtype=np.float64)
+        bucket_names = [f'bucket_{i}' for i in range(len(thresholds) - 1)]
+    else:
+        # Legacy fixed buckets used when thresholds are absent
+        thresholds = np.array([0.0, 0.8, 1.25, 2.0, np.inf])
+        bucket_names = ['low', 'med_low', 'med_high', 'high']
+
+    size_table = size_params.get('size_table', {})
+    has_volatility = size_params.get('has_volatility_conditioning', False)
+    primary = size_params.get('size_table_2d', {}) if has_volatility else size_table
+    fallback_table = size_params.get('size_table_2d', size_table)
+    inventory_buckets = size_params.get('inventory_buckets', [])
+    if not inventory_buckets:
+        inventory_buckets = ['bucket_0', 'bucket_1', 'bucket_2', 'bucket_3']
+    size_table_1d = size_params.get('size_table_1d', {})
+    median_size = float(np.median(list(size_table.values()))) if size_table else 1.0
+
+    lut = np.empty((len(labels), len(bucket_names)))
+    exact_hit = np.zeros((len(labels), len(bucket_names)), dtype=bool)
+    for p, label in enumerate(labels):
+        for b, bucket_name in enumerate(bucket_names):
+            if f'{label}|{bucket_name}' in primary:
+                lut[p, b] = primary[f'{label}|{bucket_name}']
+                exact_hit[p, b] = True
+                continue
+            value = None
+            for fallback_bucket in inventory_buckets:
+                if f'{label}|{fallback_bucket}' in fallback_table:
+                    value = fallback_table[f'{label}|{fallback_bucket}']
+                    break
+            if value is None:
+                value = size_table_1d.get(label)
+            if value is None:
+                value = median_size
+            lut[p, b] = value
+
+    return bin_edges, thresholds, lut, exact_hit
+
+
+@njit(cache=True, nogil=True)
+def _simulate_market(ts, up, down, delta, cand_idx,
+                     up_min, up_max, down_min, down_max,
+                     mode_code, momentum_threshold,
+                     has_cadence, min_inter_ms,
+                     max_total, max_up, max_down,
+                     up_bucket, down_bucket, inv_thresholds, size_lut):
+    """
+    Run the stateful simulation loop for one market's candidate rows.
+
+    Compiled mirror of should_trade / _check_inventory / get_size for the
+    simulate_policy path: cand_idx holds the rows already inside an entry
+    band, NaN disables a band, mode_code is 0/1/2 for none/momentum/
+    reversion, and size_lut comes from _build_size_lut. up_bucket and
+    down_bucket carry the price-bucket index per candidate row, digitized
+    in one batch by the caller. No fastmath: the NaN checks are
+    load-bearing.
+
+    Returns:
+        (row_idx, side_is_up, shares) arrays, one entry per executed trade
+    """
+    n = cand_idx.shape[0]
+    out_idx = np.empty(n, dtype=np.int64)
+    out_up = np.empty(n, dtype=np.bool_)
+    out_shares = np.empty(n)
+    n_out = 0
+
+    inv_up = 0.0
+    inv_down = 0.0
+    last_trade_ts = np.nan
+    eps = 1e-6
+    n_inv_buckets = size_lut.shape[1]
+
+    for k in range(n):
+        i = cand_idx[k]
+
+        # Cadence: minimum inter-trade time
+        if has_cadence and not np.isnan(last_trade_ts):
+            if ts[i] - last_trade_ts < min_inter_ms:
+                continue
+
+        up_in_band = (not np.isnan(up_min)) and up_min <= up[i] and up[i] <= up_max
+        down_in_band = (not np.isnan(down_min)) and down_min <= down[i] and down[i] <= down_max
+
+        # Momentum/reversion gate; identical for both sides, so a failure
+        # rejects the row outright (matching should_trade's early return)
+        if (up_in_band or down_in_band) and mode_code != 0 and not np.isnan(delta[i]):
+            if mode_code == 1 and delta[i] < momentum_threshold:
+                continue
+            if mode_code == 2 and delta[i] > -momentum_threshold:
+                continue
+
+        # Side selection with inventory limits; UP is tried first
+        total = inv_up + inv_down
+        side_is_up = False
+        traded = False
+        if up_in_band and total < max_total and inv_up < max_up:
+            side_is_up = True
+            traded = True
+        elif down_in_band and total < max_total and inv_down < max_down:
+            traded = True
+        if not traded:
+            continue
+
+        # Size lookup: price bucket x inventory bucket integer indexing
+        bucket_idx = up_bucket[k] if side_is_up else down_bucket[k]
+
+        ratio = inv_up / max(inv_down, eps)
+        inv_bucket_idx = n_inv_buckets - 1
+        for b in range(n_inv_buckets):
+            if ratio <= inv_thresholds[b + 1]:
+                inv_bucket_idx = b
+                break
+
+        shares = size_lut[bucket_idx, inv_bucket_idx]
+
+        out_idx[n_out] = i
+        out_up[n_out] = side_is_up
+        out_shares[n_out] = shares
+        n_out += 1
+
+        if side_is_up:
+            inv_up += shares
+        else:
+            inv_down += shares
+        last_trade_ts = ts[i]
+
+    return out_idx[:n_out], out_up[:n_out], out_shares[:n_out]
+
+
 def simulate_policy(tape: pd.DataFrame, trades: pd.DataFrame, params: Dict[str, Any]) -> pd.DataFrame:
     """
     Simulate trading policy on the tape and generate simulated trades.
@@ -212,47 +401,134 @@ def simulate_policy(tape: pd.DataFrame, trades: pd.DataFrame, params: Dict[str,
         Dataframe with simulated trades
     """
     simulator = PolicySimulator(params)
-    simulated_trades = []
-    
-    tape = tape.sort_values(['market', 'Timestamp']).reset_index(drop=True)
-    
-    for market in tape['market'].unique():
-        market_tape = tape[tape['market'] == market].copy()
-        market_tape = market_tape.sort_values('Timestamp').reset_index(drop=True)
-        
-        # Get actual trades for this market for delta computation
-        market_actual_trades = trades[trades['market'] == market].copy()
-        
-        # Compute deltas if available (simplified - would need proper computation)
-        for idx, row in market_tape.iterrows():
-            timestamp = row['Timestamp']
-            up_px = row['Price UP ($)']
-            down_px = row['Price DOWN ($)']
-            
-            # Get delta_5s if available (simplified)
-            delta_5s = None
-            if 'delta_5s_side_px' in row:
-                delta_5s = row['delta_5s_side_px']
-            
-            should_trade, side = simulator.should_trade(market, timestamp, up_px, down_px, delta_5s)
-            
-            if should_trade:
-                side_px = up_px if side == 'UP' else down_px
-                shares = simulator.get_size(market, side, side_px)
-                
-                simulated_trades.append({
-                    'Timestamp': timestamp,
-                    'market': market,
-                    'side': side,
-                    'shares': shares,
-                    'Price UP ($)': up_px,
-                    'Price DOWN ($)': down_px,
-                    'side_px_at_trade': side_px
-                })
-                
-                simulator.execute_trade(market, timestamp, side, shares)
-    
-    return pd.DataFrame(simulated_trades)
+
+    # Warm the numba kernel (loads the on-disk cache or compiles once) so
+    # JIT latency doesn't land inside the per-market dispatch
+    _simulate_market(np.zeros(1, dtype=np.int64), np.zeros(1), np.zeros(1), np.zeros(1),
+                     np.zeros(0, dtype=np.int64),
+                     np.nan, np.nan, np.nan, np.nan, 0, 0.0, False, 0.0,
+                     np.inf, np.inf, np.inf,
+                     np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64),
+                     np.array([0.0, np.inf]), np.ones((1, 1)))
+
+    # prepare_tape already orders each market by Timestamp, and groupby
+    # preserves intra-group order — only pay for the sort when some market's
+    # timestamps actually arrive out of order (markets may interleave; only
+    # the per-market order matters to the kernel)
+    if not tape.groupby('market', sort=False)['Timestamp'].is_monotonic_increasing.all():
+        tape = tape.sort_values(['market', 'Timestamp']).reset_index(drop=True)
+
+    # Each market simulates independently (state is per-market), so fan the
+    # markets out over threads; the nogil kernel runs concurrently
+    per_market_frames = Parallel(n_jobs=-1, backend='threading')(
+        delayed(_simulate_policy_one_market)(market, market_tape, simulator)
+        for market, market_tape in tape.groupby('market', sort=False))
+
+    per_market_frames = [frame for frame in per_market_frames if len(frame) > 0]
+    if not per_market_frames:
+        return pd.DataFrame()
+
+    return pd.concat(per_market_frames, ignore_index=True)
+
+
+def _simulate_policy_one_market(market: str, market_tape: pd.DataFrame,
+                                simulator: PolicySimulator) -> pd.DataFrame:
+    """Simulate one market's tape (thread-pool worker).
+
+    Reads the simulator's parameter dicts but keeps all mutable state
+    (inventory, last trade time) inside the kernel call, so workers share
+    nothing writable.
+    """
+    entry = simulator.entry_params.get(market)
+    if entry is None:
+        # should_trade rejects unknown markets outright
+        return pd.DataFrame()
+
+    ts = market_tape['Timestamp'].to_numpy()
+    up = market_tape['Price UP ($)'].to_numpy(dtype=np.float64)
+    down = market_tape['Price DOWN ($)'].to_numpy(dtype=np.float64)
+    if 'delta_5s_side_px' in market_tape.columns:
+        delta = market_tape['delta_5s_side_px'].to_numpy(dtype=np.float64)
+    else:
+        delta = None
+
+    # Vectorize the stateless entry-band gate over the whole tape; the
+    # stateful gates (cadence, inventory) only ever run on the few
+    # candidate rows whose price is inside a band
+    up_in_band = np.zeros(len(ts), dtype=bool)
+    if entry.get('up_price_min') is not None and entry.get('up_price_max') is not None:
+        up_in_band = (up >= entry['up_price_min']) & (up <= entry['up_price_max'])
+    down_in_band = np.zeros(len(ts), dtype=bool)
+    if entry.get('down_price_min') is not None and entry.get('down_price_max') is not None:
+        down_in_band = (down >= entry['down_price_min']) & (down <= entry['down_price_max'])
+
+    candidate = up_in_band | down_in_band
+
+    # Flatten the per-market parameters into kernel scalars
+    cadence = simulator.cadence_params.get(market)
+    inv_params = simulator.inventory_params.get(market) or {}
+    mode = entry.get('mode', 'none')
+    mode_code = 1 if mode == 'momentum' else (2 if mode == 'reversion' else 0)
+
+    # The momentum/reversion gate is stateless and rejects a row outright,
+    # so it folds into the candidate mask too (NaN delta passes the gate)
+    if mode_code != 0 and delta is not None:
+        threshold = float(entry.get('momentum_threshold') or 0.0)
+        if mode_code == 1:
+            gate_fail = delta < threshold
+        else:
+            gate_fail = delta > -threshold
+        candidate &= ~(gate_fail & ~np.isnan(delta))
+
+    cand_idx = np.nonzero(candidate)[0]
+    if len(cand_idx) == 0:
+        return pd.DataFrame()
+
+    size_params = simulator.size_params.get(market)
+    if size_params:
+        bin_edges, inv_thresholds, size_lut, _ = simulator._market_size_lut(market)
+    else:
+        # get_size falls back to a flat 1.0 for unknown markets
+        bin_edges = np.array([0.0, 1.0])
+        inv_thresholds = np.array([0.0, np.inf])
+        size_lut = np.ones((1, 1))
+
+    # One batched digitize per side instead of a scalar searchsorted per
+    # executed trade inside the kernel
+    n_price = size_lut.shape[0]
+    up_bucket = np.clip(np.digitize(up[cand_idx], bin_edges) - 1, 0, n_price - 1)
+    down_bucket = np.clip(np.digitize(down[cand_idx], bin_edges) - 1, 0, n_price - 1)
+
+    res_idx, res_up, res_shares = _simulate_market(
+        ts, up, down,
+        delta if delta is not None else np.full(len(ts), np.nan),
+        cand_idx,
+        float(entry['up_price_min']) if entry.get('up_price_min') is not None else np.nan,
+        float(entry['up_price_max']) if entry.get('up_price_max') is not None else np.nan,
+        float(entry['down_price_min']) if entry.get('down_price_min') is not None else np.nan,
+        float(entry['down_price_max']) if entry.get('down_price_max') is not None else np.nan,
+        mode_code,
+        float(entry.get('momentum_threshold') or 0.0),
+        cadence is not None,
+        float(cadence.get('min_inter_trade_ms', 0)) if cadence is not None else 0.0,
+        float(inv_params.get('max_total_shares', np.inf)),
+        float(inv_params.get('max_up_shares', np.inf)),
+        float(inv_params.get('max_down_shares', np.inf)),
+        up_bucket, down_bucket, inv_thresholds, size_lut)
+
+    # The kernel already returns preallocated, truncated arrays; build the
+    # frame columnar rather than through a list of per-trade dicts
+    trade_up = up[res_idx]
+    trade_down = down[res_idx]
+    return pd.DataFrame({
+        'Timestamp': ts[res_idx],
+        'market': market,
+        'side': np.where(res_up, 'UP', 'DOWN'),
+        'shares': res_shares,
+        'Price UP ($)': trade_up,
+        'Price DOWN ($)': trade_down,
+        'side_px_at_trade': np.where(res_up, trade_up, trade_down)
+    })
 
 
 def compute_validation_metrics(actual_trades: pd.DataFrame, simulated_trades: pd.DataFrame) -> Dict[str, Any]:
@@ -267,19 +543,24 @@ def compute_validation_metrics(actual_trades: pd.DataFrame, simulated_trades: pd
     Returns:
         Dictionary with per-market validation metrics: {market: {recall, precision, size_mape, ...}}
     """
-    actual_watch = actual_trades[actual_trades['bot'] == 'WATCH'].copy()
+    actual_watch = actual_trades[actual_trades['bot'] == 'WATCH']
     
     if len(actual_watch) == 0 or len(simulated_trades) == 0:
         return {'error': 'No trades to compare'}
     
     per_market_metrics = {}
-    
+    per_market_matched_dfs = []
+
+    # Partition both frames by market in one pass each instead of
+    # re-scanning the whole frame per market
+    sim_by_market = {market: group
+                     for market, group in simulated_trades.groupby('market', sort=False)}
+
     # Compute metrics per market
-    for market in actual_watch['market'].unique():
-        market_actual = actual_watch[actual_watch['market'] == market].copy()
-        market_sim = simulated_trades[simulated_trades['market'] == market].copy()
-        
-        if len(market_sim) == 0:
+    for market, market_actual in actual_watch.groupby('market', sort=False):
+        market_sim = sim_by_market.get(market)
+
+        if market_sim is None or len(market_sim) == 0:
             per_market_metrics[market] = {
                 'recall': 0.0,
                 'precision': 0.0,
@@ -291,32 +572,48 @@ def compute_validation_metrics(actual_trades: pd.DataFrame, simulated_trades: pd
             }
             continue
         
-        market_sim = market_sim.sort_values('Timestamp').reset_index(drop=True)
-        matched = []
-        
-        for _, actual_trade in market_actual.iterrows():
-            actual_ts = actual_trade['Timestamp']
-            
-            # Find nearest simulated trade within ±2000ms
-            time_diffs_ms = abs(market_sim['Timestamp'] - actual_ts)
-            within_window = time_diffs_ms <= 2000.0
-            
-            if within_window.any():
-                nearest_idx = time_diffs_ms[within_window].idxmin()
-                sim_trade = market_sim.loc[nearest_idx]
-                
-                matched.append({
-                    'market': market,
-                    'dt_ms': float(time_diffs_ms[nearest_idx]),
-                    'same_side': actual_trade['side'] == sim_trade['side'],
-                    'size_ratio': sim_trade['shares'] / actual_trade['shares'] if actual_trade['shares'] > 0 else 0,
-                    'actual_shares': actual_trade['shares'],
-                    'sim_shares': sim_trade['shares'],
-                    'fill_px_diff': abs(actual_trade.get('fill_px', 0) - sim_trade.get('side_px_at_trade', 0))
-                })
-        
-        matched_df = pd.DataFrame(matched)
-        
+        # simulate_policy emits each market's trades already in timestamp
+        # order, so only the actual side needs sorting for the merge
+        market_actual = market_actual.sort_values('Timestamp')
+
+        # Nearest simulated trade within ±2000ms for every actual trade in
+        # one O(N+M) merge pass over the time-sorted frames (ties resolve
+        # to the earlier sim trade, like the old idxmin scan). The sim
+        # timestamp is carried along to recover the match distance.
+        sim_for_merge = market_sim[['Timestamp', 'side', 'shares', 'side_px_at_trade']].copy()
+        sim_for_merge['ts_sim'] = sim_for_merge['Timestamp']
+        actual_cols = ['Timestamp', 'side', 'shares']
+        if 'fill_px' in market_actual.columns:
+            actual_cols.append('fill_px')
+        merged = pd.merge_asof(
+            market_actual[actual_cols], sim_for_merge,
+            on='Timestamp', tolerance=2000, direction='nearest',
+            suffixes=('_act', '_sim'))
+
+        matched = merged[merged['ts_sim'].notna()]
+        if len(matched) > 0:
+            actual_shares = matched['shares_act'].to_numpy(dtype=np.float64)
+            sim_shares = matched['shares_sim'].to_numpy(dtype=np.float64)
+            if 'fill_px' in matched.columns:
+                fill_px = matched['fill_px'].to_numpy(dtype=np.float64)
+            else:
+                fill_px = np.zeros(len(matched))
+            matched_df = pd.DataFrame({
+                'market': market,
+                'dt_ms': (matched['Timestamp'] - matched['ts_sim']).abs().astype(float).to_numpy(),
+                'same_side': (matched['side_act'] == matched['side_sim']).to_numpy(),
+                'size_ratio': np.divide(sim_shares, actual_shares,
+                                        out=np.zeros(len(matched)), where=actual_shares > 0),
+                'actual_shares': actual_shares,
+                'sim_shares': sim_shares,
+                'fill_px_diff': np.abs(fill_px - matched['side_px_at_trade'].to_numpy(dtype=np.float64))
+            })
+        else:
+            matched_df = pd.DataFrame()
+
+        if len(matched_df) > 0:
+            per_market_matched_dfs.append(matched_df)
+
         if len(matched_df) > 0:
             # Recall: how many actual trades were matched
             recall = len(matched_df) / len(market_actual)
@@ -331,26 +628,20 @@ def compute_validation_metrics(actual_trades: pd.DataFrame, simulated_trades: pd
             # APE = abs(predicted - actual) / max(abs(actual), eps)
             # Report as percent (multiply by 100)
             eps = 1e-6
-            size_percentage_errors = []
-            
+
             # Filter to matched trades with same side and within ±2000ms
-            matched_same_side = matched_df[matched_df['same_side'] == True].copy()
+            # (the window is already enforced in matching; cheap double-check)
+            matched_same_side = matched_df[(matched_df['same_side'] == True)
+                                           & (matched_df['dt_ms'] <= 2000.0)]
+
+            # Compute MdAPE (median) and p90 APE in one vectorized pass
             if len(matched_same_side) > 0:
-                # Already filtered to ±2000ms in matching logic, but double-check
-                matched_same_side = matched_same_side[matched_same_side['dt_ms'] <= 2000.0]
-                
-                for _, row in matched_same_side.iterrows():
-                    actual_shares = row['actual_shares']
-                    sim_shares = row['sim_shares']
-                    
-                    # Use the correct formula: abs(pred-actual) / max(abs(actual), eps)
-                    ape = abs(sim_shares - actual_shares) / max(abs(actual_shares), eps)
-                    size_percentage_errors.append(ape * 100)  # Convert to percent
-            
-            # Compute MdAPE (median) and p90 APE
-            if len(size_percentage_errors) > 0:
-                size_mape = float(np.median(size_percentage_errors))
-                size_p90_ape = float(np.percentile(size_percentage_errors, 90))
+                actual_arr = matched_same_side['actual_shares'].to_numpy()
+                sim_arr = matched_same_side['sim_shares'].to_numpy()
+                ape = np.abs(sim_arr - actual_arr) / np.maximum(np.abs(actual_arr), eps) * 100
+                quantiles = np.quantile(ape, [0.5, 0.9])
+                size_mape = float(quantiles[0])
+                size_p90_ape = float(quantiles[1])
             else:
                 size_mape = 0.0
                 size_p90_ape = 0.0
@@ -379,27 +670,13 @@ def compute_validation_metrics(actual_trades: pd.DataFrame, simulated_trades: pd
                 'simulated_count': len(market_sim)
             }
     
-    # Also compute global metrics for backward compatibility
-    all_matched = []
-    for market in actual_watch['market'].unique():
-        market_actual = actual_watch[actual_watch['market'] == market].copy()
-        market_sim = simulated_trades[simulated_trades['market'] == market].copy()
-        if len(market_sim) == 0:
-            continue
-        market_sim = market_sim.sort_values('Timestamp').reset_index(drop=True)
-        for _, actual_trade in market_actual.iterrows():
-            actual_ts = actual_trade['Timestamp']
-            time_diffs = abs(market_sim['Timestamp'] - actual_ts) / 1000.0
-            within_window = time_diffs <= 2.0
-            if within_window.any():
-                nearest_idx = time_diffs[within_window].idxmin()
-                sim_trade = market_sim.loc[nearest_idx]
-                all_matched.append({
-                    'same_side': actual_trade['side'] == sim_trade['side'],
-                    'size_ratio': sim_trade['shares'] / actual_trade['shares'] if actual_trade['shares'] > 0 else 0,
-                })
-    
-    all_matched_df = pd.DataFrame(all_matched)
+    # Also compute global metrics for backward compatibility. The per-market
+    # matches already carry same_side and size_ratio, so the global view is
+    # just their concatenation — no second matching pass.
+    if per_market_matched_dfs:
+        all_matched_df = pd.concat(per_market_matched_dfs, ignore_index=True)
+    else:
+        all_matched_df = pd.DataFrame()
     global_metrics = {}
     if len(all_matched_df) > 0:
         global_metrics = {
@@ -441,27 +718,17 @@ def validate_model(tape: pd.DataFrame, trades: pd.DataFrame, params: Dict[str, A
         Dictionary with validation results
     """
     print("\n=== Validating Model ===")
-    
-    # Convert params to old format for PolicySimulator (it expects param-type-first)
-    params_old_format = {
-        'entry_params': {'per_market': {}},
-        'size_params': {'per_market': {}},
-        'inventory_params': {'per_market': {}},
-        'cadence_params': {'per_market': {}}
-    }
-    for market, market_params in params.items():
-        params_old_format['entry_params']['per_market'][market] = market_params.get('entry_params', {})
-        params_old_format['size_params']['per_market'][market] = market_params.get('size_params', {})
-        params_old_format['inventory_params']['per_market'][market] = market_params.get('inventory_params', {})
-        params_old_format['cadence_params']['per_market'][market] = market_params.get('cadence_params', {})
-    
-    # Simulate policy
+
+    # Simulate policy (PolicySimulator accepts the market-first layout
+    # directly; no intermediate params_old_format copy)
     print("Simulating policy...")
-    simulated_trades = simulate_policy(tape, trades, params_old_format)
+    simulated_trades = simulate_policy(tape, trades, params)
     print(f"Generated {len(simulated_trades)} simulated trades")
     
-    # Compute metrics
-    metrics = compute_validation_metrics(trades, simulated_trades)
+    # Compute metrics on the WATCH slice, filtered once here rather than
+    # re-scanning the full trades frame inside
+    watch_trades = trades[trades['bot'] == 'WATCH']
+    metrics = compute_validation_metrics(watch_trades, simulated_trades)
     
     # Print per-market validation metrics
     print("\n=== Per-Market Validation Metrics ===")